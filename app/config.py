@@ -0,0 +1,21 @@
+import os
+from functools import lru_cache
+from typing import Optional
+from pydantic import BaseModel
+from dotenv import load_dotenv
+
+class Settings(BaseModel):
+    """Third-party credentials, read from the environment once per process"""
+    gemini_api_key: Optional[str] = None
+    replicate_api_token: Optional[str] = None
+
+@lru_cache
+def get_settings() -> Settings:
+    """Return the process-wide settings; use as a FastAPI dependency so tests can override it"""
+    # Load .env here rather than relying on another module having done it first,
+    # since the result is cached for the life of the process
+    load_dotenv()
+    return Settings(
+        gemini_api_key=os.getenv("GEMINI_API_KEY"),
+        replicate_api_token=os.getenv("REPLICATE_API_TOKEN")
+    )
@@ -1,34 +1,101 @@
 # app/main.py
-from fastapi import FastAPI, Depends, HTTPException, Request, status
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 import logging
+import logging.config
 import sys
 import os
+import queue
+import asyncio
+import anyio
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+from app.middleware import APIKeyMiddleware, HealthCheckMiddleware, MediaAwareGZipMiddleware
 from app.routers import example, transcription, image_generation, svg_generation, audio_processing, video
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,  # Set to DEBUG to see all logs
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Configure logging: handlers on the request path only enqueue records,
+# a background listener thread does the actual write to stdout
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+log_queue = queue.Queue(-1)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "queue": {"()": QueueHandler, "queue": log_queue},
+    },
+    "loggers": {
+        # DEBUG level for our specific modules
+        "app.services.image_generator": {"level": "DEBUG"},
+        "app.routers.image_generation": {"level": "DEBUG"},
+        "app.routers.svg_generation": {"level": "DEBUG"},
+        "app.services.twitter_downloader": {"level": "DEBUG"},
+        "app.services.video_manager": {"level": "DEBUG"},
+        "app.services.video_pipeline": {"level": "DEBUG"},
+    },
+    "root": {"level": "INFO", "handlers": ["queue"]},  # Set to DEBUG to see all logs
+}
+logging.config.dictConfig(LOGGING)
 
-# Set DEBUG level for our specific modules
-logging.getLogger('app.services.image_generator').setLevel(logging.DEBUG)
-logging.getLogger('app.routers.image_generation').setLevel(logging.DEBUG)
-logging.getLogger('app.routers.svg_generation').setLevel(logging.DEBUG)
-logging.getLogger('app.services.twitter_downloader').setLevel(logging.DEBUG)
-logging.getLogger('app.routers.twitter_video').setLevel(logging.DEBUG)
-logging.getLogger('app.services.video_manager').setLevel(logging.DEBUG)  # Set to DEBUG
-logging.getLogger('app.services.video_pipeline').setLevel(logging.DEBUG)  # Add this line
+stream_handler = logging.StreamHandler(sys.stdout)
+stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+log_listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
 
 # Create logger for this module
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+# API key is read once at import instead of on every request
+API_KEY = os.getenv("API_KEY")
+API_KEY_BYTES = (API_KEY or "").encode()
+
+# Path prefixes that don't require API key (the root "/" is matched exactly)
+PUBLIC_PREFIXES = (
+    "/video/serve/",  # Video files
+    "/video/serve-audio/",  # Audio files
+    "/video/serve-transcript/",  # Transcript files
+    "/video/serve-collage/",  # Collage images
+)
+
+# Health check payload never changes, serialize it once
+HEALTH_JSON = orjson.dumps({
+    "status": "ok",
+    "message": "API is running",
+    "version": "1.0.0"
+})
+
+# Threads available for blocking calls. asyncio.to_thread runs on the loop's default
+# executor (min(32, cpu_count + 4) threads unless replaced) and sync endpoints and file
+# responses on anyio's limiter (40 tokens). Most of those calls wait on Replicate,
+# ffmpeg or the disk, so small machines need more threads than cores
+THREAD_POOL_SIZE = int(os.getenv("THREAD_POOL_SIZE", 64))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the log listener and validate configuration for the lifetime of the app."""
+    log_listener.start()
+    executor = None
+    try:
+        # Fail fast at boot so the middleware never has to check for a missing key
+        if not API_KEY:
+            logger.error("API_KEY environment variable not set")
+            raise RuntimeError("API_KEY environment variable not set")
+        executor = ThreadPoolExecutor(max_workers=THREAD_POOL_SIZE, thread_name_prefix="to-thread")
+        asyncio.get_running_loop().set_default_executor(executor)
+        anyio.to_thread.current_default_thread_limiter().total_tokens = THREAD_POOL_SIZE
+        logger.info("Application started")
+        yield
+        logger.info("Application shutting down")
+    finally:
+        if executor is not None:
+            # Don't keep the process alive for queued blocking calls
+            executor.shutdown(wait=False, cancel_futures=True)
+        # Flush queued log records
+        log_listener.stop()
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -41,51 +108,11 @@ app.add_middleware(
     max_age=600,  # Cache preflight requests for 10 minutes
 )
 
+# Compress JSON responses; media files are passed through as-is
+app.add_middleware(MediaAwareGZipMiddleware, minimum_size=500, compresslevel=5)
+
 # API Key middleware
-@app.middleware("http")
-async def api_key_middleware(request: Request, call_next):
-    # Skip API key check for certain paths
-    path = request.url.path
-    
-    # Skip API key check for OPTIONS requests (preflight)
-    if request.method == "OPTIONS":
-        return await call_next(request)
-    
-    # Public paths that don't require API key
-    public_paths = [
-        "/",  # Root/health check (exact match)
-        "/video/serve/",  # Video files
-        "/video/serve-audio/",  # Audio files
-        "/video/serve-transcript/",  # Transcript files
-        "/video/serve-collage/",  # Collage images
-    ]
-    
-    # Check if the path is public (exact match for root, prefix match for others)
-    is_public_path = path == "/" or any(
-        path.startswith(public_path) for public_path in public_paths if public_path != "/"
-    )
-    
-    if is_public_path:
-        return await call_next(request)
-    
-    # Get API key from environment
-    api_key = os.getenv("API_KEY")
-    if not api_key:
-        logger.error("API_KEY environment variable not set")
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={"detail": "Server configuration error"}
-        )
-    
-    # Check if the API key is in the request headers
-    request_api_key = request.headers.get("x-api-key")
-    if not request_api_key or request_api_key != api_key:
-        return JSONResponse(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            content={"detail": "Invalid or missing API key"}
-        )
-    
-    return await call_next(request)
+app.add_middleware(APIKeyMiddleware, api_key=API_KEY_BYTES, public_prefixes=PUBLIC_PREFIXES)
 
 # Include routers
 app.include_router(example.router)
@@ -95,19 +122,14 @@ app.include_router(svg_generation.router)
 app.include_router(audio_processing.router)
 app.include_router(video.router)
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on application startup."""
-    logger.info("Application started")
+# Answer health checks ahead of the middleware stack; added last so it runs first
+app.add_middleware(HealthCheckMiddleware, body=HEALTH_JSON)
 
-# Add root route for health checks
+# Add root route for health checks (documents the endpoint; GET/HEAD are
+# answered by HealthCheckMiddleware before reaching it)
 @app.get("/")
 async def root():
-    return JSONResponse({
-        "status": "ok",
-        "message": "API is running",
-        "version": "1.0.0"
-    })
+    return Response(HEALTH_JSON, media_type="application/json")
 
 # Import and include your routers here
 # Example:
@@ -0,0 +1,108 @@
+import hmac
+from typing import Tuple
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Content types that are already compressed and must be streamed as-is
+PRECOMPRESSED_MEDIA_TYPES = ("video/", "audio/", "image/")
+
+class MediaAwareGZipResponder(GZipResponder):
+    """GZip responder that passes already-compressed media through untouched."""
+
+    async def send_with_compression(self, message: Message) -> None:
+        await super().send_with_compression(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if content_type.startswith(PRECOMPRESSED_MEDIA_TYPES):
+                self.content_type_is_excluded = True
+
+class MediaAwareGZipMiddleware(GZipMiddleware):
+    """Compress JSON/text responses while leaving video, audio and image files alone.
+
+    Media files are served with range support and compressing them again only
+    burns CPU and breaks partial content responses.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, compresslevel: int = 5) -> None:
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if "gzip" in headers.get("Accept-Encoding", ""):
+            responder = MediaAwareGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+
+        await responder(scope, receive, send)
+
+class HealthCheckMiddleware:
+    """Answer load balancer probes on the root path before any other middleware runs.
+
+    Must be registered last so it sits outermost; CORS, API key checks and
+    routing are never reached for GET/HEAD requests on ``path``.
+    """
+
+    def __init__(self, app: ASGIApp, body: bytes, path: str = "/") -> None:
+        self.app = app
+        self.path = path
+        self.body = body
+        self.headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] != self.path or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        await send({"type": "http.response.start", "status": 200, "headers": self.headers})
+        body = b"" if scope["method"] == "HEAD" else self.body
+        await send({"type": "http.response.body", "body": body})
+
+class APIKeyMiddleware:
+    """Reject requests without a valid ``x-api-key`` header.
+
+    OPTIONS preflights, the root path and any path under ``public_prefixes``
+    are let through. Implemented as plain ASGI so response bodies stream
+    straight through instead of being buffered by BaseHTTPMiddleware.
+    """
+
+    unauthorized_body = b'{"detail":"Invalid or missing API key"}'
+
+    def __init__(self, app: ASGIApp, api_key: bytes, public_prefixes: Tuple[str, ...] = ()) -> None:
+        self.app = app
+        self.api_key = api_key
+        self.public_prefixes = public_prefixes
+        self.unauthorized_headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(self.unauthorized_body)).encode("latin-1")),
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if path == "/" or path.startswith(self.public_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        provided = b""
+        for name, value in scope["headers"]:
+            if name == b"x-api-key":
+                provided = value
+                break
+
+        if not self.api_key or not hmac.compare_digest(provided, self.api_key):
+            await send({"type": "http.response.start", "status": 401, "headers": self.unauthorized_headers})
+            await send({"type": "http.response.body", "body": self.unauthorized_body})
+            return
+
+        await self.app(scope, receive, send)
@@ -1,10 +1,11 @@
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
-import requests
-from io import BytesIO
-from pydub import AudioSegment
+from pydantic import BaseModel, ConfigDict
+import httpx
+import asyncio
+import json
 import logging
+from typing import AsyncIterator, Tuple
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -15,17 +16,30 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# Size of the chunks read from ffmpeg's stdout and streamed to the client
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Input URL for ffmpeg/ffprobe. The cache protocol buffers stdin to a temp file so the
+# demuxer can seek back, which MP4/M4A files with the moov atom at the end require
+PIPE_INPUT = "cache:pipe:0"
+
+# Per-operation timeout (connect/read/write/pool) for fetching the source audio
+DOWNLOAD_TIMEOUT = 30.0
+
 class AudioTrimRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     original: str
     modified: str
 
-def download_audio(url: str) -> AudioSegment:
-    """Download audio from a URL and return as AudioSegment."""
+async def download_audio(client: httpx.AsyncClient, url: str) -> bytes:
+    """Download audio from a URL and return the raw bytes."""
     try:
         logger.info(f"Downloading audio from: {url}")
-        r = requests.get(url)
-        r.raise_for_status()
-        return AudioSegment.from_file(BytesIO(r.content))
+        async with client.stream("GET", url) as r:
+            r.raise_for_status()
+            chunks = [chunk async for chunk in r.aiter_bytes(STREAM_CHUNK_SIZE)]
+        return b"".join(chunks)
     except Exception as e:
         logger.error(f"Error downloading audio from {url}: {str(e)}")
         raise HTTPException(
@@ -33,39 +47,116 @@ def download_audio(url: str) -> AudioSegment:
             detail=f"Failed to download audio: {str(e)}"
         )
 
+async def probe_audio(data: bytes) -> Tuple[float, str]:
+    """Return the duration in seconds and codec name of the first audio stream."""
+    proc = await asyncio.create_subprocess_exec(
+        "ffprobe", "-v", "error",
+        "-select_streams", "a:0",
+        "-show_entries", "format=duration:stream=codec_name",
+        "-of", "json",
+        "-i", PIPE_INPUT,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await proc.communicate(data)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffprobe failed: {stderr.decode(errors='replace').strip()}")
+
+    info = json.loads(stdout)
+    streams = info.get("streams") or [{}]
+    # ffprobe omits the duration (or reports "N/A") for inputs it cannot time
+    try:
+        duration = float(info.get("format", {})["duration"])
+    except (KeyError, TypeError, ValueError):
+        duration = None
+    if duration is None or duration <= 0:
+        raise HTTPException(
+            status_code=400,
+            detail="Could not determine audio duration"
+        )
+    return duration, streams[0].get("codec_name", "")
+
+async def feed_stdin(proc: asyncio.subprocess.Process, data: bytes) -> None:
+    """Write the input to the subprocess and close stdin so it sees EOF."""
+    try:
+        proc.stdin.write(data)
+        await proc.stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        # ffmpeg stops reading once it has everything it needs for -t
+        pass
+    finally:
+        proc.stdin.close()
+
+async def stream_trimmed(proc: asyncio.subprocess.Process, writer: asyncio.Task, first_chunk: bytes) -> AsyncIterator[bytes]:
+    """Yield ffmpeg's output as it is produced, then reap the process."""
+    try:
+        chunk = first_chunk
+        while chunk:
+            yield chunk
+            chunk = await proc.stdout.read(STREAM_CHUNK_SIZE)
+        await writer
+        await proc.wait()
+    finally:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+
 @router.post("/trim", response_class=StreamingResponse)
-def trim_audio(data: AudioTrimRequest):
+async def trim_audio(data: AudioTrimRequest):
     """Trim the modified audio to match the duration of the original audio."""
     try:
         logger.info("Starting audio trimming process")
-        audio_original = download_audio(data.original)
-        audio_modified = download_audio(data.modified)
-
-        duration = len(audio_original)
-        logger.info(f"Original audio duration: {duration}ms")
-        logger.info(f"Modified audio duration: {len(audio_modified)}ms")
-        
-        if len(audio_modified) < duration:
+        async with httpx.AsyncClient(timeout=DOWNLOAD_TIMEOUT, follow_redirects=True) as client:
+            audio_original, audio_modified = await asyncio.gather(
+                download_audio(client, data.original),
+                download_audio(client, data.modified)
+            )
+
+        (duration, _), (modified_duration, modified_codec) = await asyncio.gather(
+            probe_audio(audio_original),
+            probe_audio(audio_modified)
+        )
+        logger.info(f"Original audio duration: {duration}s")
+        logger.info(f"Modified audio duration: {modified_duration}s")
+
+        if modified_duration < duration:
             logger.warning("Modified audio is shorter than original, returning unmodified")
-            trimmed = audio_modified
         else:
-            logger.info(f"Trimming modified audio to: {duration}ms")
-            trimmed = audio_modified[:duration]
+            logger.info(f"Trimming modified audio to: {duration}s")
+
+        # MP3 input can be cut without decoding; anything else is transcoded once
+        codec_args = ["-c:a", "copy"] if modified_codec == "mp3" else ["-c:a", "libmp3lame", "-q:a", "2"]
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-v", "error",
+            "-i", PIPE_INPUT,
+            "-t", str(duration),
+            "-vn", *codec_args,
+            "-f", "mp3", "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        writer = asyncio.create_task(feed_stdin(proc, audio_modified))
 
-        out_io = BytesIO()
-        logger.info("Exporting trimmed audio to MP3 format")
-        trimmed.export(out_io, format="mp3")
-        out_io.seek(0)
+        # Read the first chunk up front so an ffmpeg failure still surfaces as an HTTP error
+        first_chunk = await proc.stdout.read(STREAM_CHUNK_SIZE)
+        if not first_chunk:
+            await writer
+            returncode = await proc.wait()
+            raise RuntimeError(f"ffmpeg produced no output (exit code {returncode})")
 
-        logger.info("Audio trimming completed successfully")
+        logger.info("Streaming trimmed audio as MP3")
         return StreamingResponse(
-            out_io, 
-            media_type="audio/mpeg", 
+            stream_trimmed(proc, writer, first_chunk),
+            media_type="audio/mpeg",
             headers={"Content-Disposition": "inline; filename=trimmed.mp3"}
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception("An unexpected error occurred during audio trimming")
         raise HTTPException(
             status_code=500,
             detail=str(e)
-        ) 
\ No newline at end of file
+        )
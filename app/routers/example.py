@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import List
+from typing import Dict, List
 
 router = APIRouter(
     prefix="/example",
@@ -13,24 +13,24 @@ class Item(BaseModel):
     name: str
     description: str = None
 
-# Example in-memory database
-items = [
-    Item(id=1, name="Item 1", description="This is item 1"),
-    Item(id=2, name="Item 2", description="This is item 2"),
-]
+# Example in-memory database, keyed by item ID
+items_by_id: Dict[int, Item] = {
+    1: Item(id=1, name="Item 1", description="This is item 1"),
+    2: Item(id=2, name="Item 2", description="This is item 2"),
+}
 
 @router.get("/", response_model=List[Item])
 async def read_items():
-    return items
+    return list(items_by_id.values())
 
 @router.get("/{item_id}", response_model=Item)
 async def read_item(item_id: int):
-    for item in items:
-        if item.id == item_id:
-            return item
-    raise HTTPException(status_code=404, detail="Item not found")
+    item = items_by_id.get(item_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return item
 
 @router.post("/", response_model=Item)
 async def create_item(item: Item):
-    items.append(item)
+    items_by_id[item.id] = item
     return item 
\ No newline at end of file
@@ -1,8 +1,8 @@
-import os
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional, Dict
 import logging
+from app.config import Settings, get_settings
 from app.services.image_generator import generate_multiple_images
 
 # Configure logging
@@ -15,9 +15,13 @@ router = APIRouter(
 )
 
 class ImagePrompt(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     prompt: str
 
 class BatchImageGeneration(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     prompts: List[str]
 
 class ImageGenerationResult(BaseModel):
@@ -32,7 +36,7 @@ class BatchGenerationResponse(BaseModel):
     output_directory: str
 
 @router.post("/generate", response_model=BatchGenerationResponse)
-async def generate_images(batch: BatchImageGeneration):
+async def generate_images(batch: BatchImageGeneration, settings: Settings = Depends(get_settings)):
     """
     Generate images from a list of prompts using Gemini API.
     
@@ -50,7 +54,7 @@ async def generate_images(batch: BatchImageGeneration):
             raise HTTPException(status_code=400, detail="No prompts provided")
         
         # Check if API key is set in environment
-        if not os.getenv("GEMINI_API_KEY"):
+        if not settings.gemini_api_key:
             logger.error("GEMINI_API_KEY environment variable not set")
             raise HTTPException(
                 status_code=500,
@@ -58,7 +62,7 @@ async def generate_images(batch: BatchImageGeneration):
             )
         
         # Generate the images
-        result = await generate_multiple_images(prompts=batch.prompts)
+        result = await generate_multiple_images(prompts=batch.prompts, api_key=settings.gemini_api_key)
         
         # Log results
         success_count = sum(1 for r in result["results"] if r["success"])
@@ -70,6 +74,8 @@ async def generate_images(batch: BatchImageGeneration):
             output_directory=result["output_directory"]
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in image generation endpoint: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
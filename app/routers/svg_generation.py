@@ -1,9 +1,12 @@
 import os
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from pydantic import BaseModel
-from typing import Optional, List, Dict
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List, Dict, Tuple, Iterable, Iterator, Callable, Union
+from datetime import datetime
 import logging
+import httpx
 import replicate
+from replicate.client import RetryTransport
 import uuid
 import json
 import shutil
@@ -12,12 +15,34 @@ from PIL import Image
 import subprocess
 import io
 import asyncio
+import copy
+import re
+import threading
+import itertools
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
+from app.config import Settings, get_settings
 from app.services.job_status import JobStatus, JobStatusManager, FrameResult
-from fastapi.responses import FileResponse
+from app.utils.paths import GENERATED_IMAGES_DIR, get_output_directory
+from app.utils.responses import MediaFileResponse, stat_file
+from fastapi.responses import Response
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Render with librsvg in-process when its GObject bindings are installed,
+# otherwise fall back to spawning rsvg-convert for every frame
+try:
+    import gi
+    gi.require_version("Rsvg", "2.0")
+    from gi.repository import Rsvg
+    import cairo
+except (ImportError, ValueError):
+    Rsvg = None
+    logger.info("librsvg bindings not available, rendering frames with rsvg-convert")
+
 router = APIRouter(
     prefix="/svg",
     tags=["svg-generation"],
@@ -25,6 +50,8 @@ router = APIRouter(
 )
 
 class SVGGenerationRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     prompts: List[str]
 
 class SVGGenerationResult(BaseModel):
@@ -39,10 +66,14 @@ class SVGGenerationResponse(BaseModel):
     output_directory: str
 
 class FrameConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: str
     duration: float
 
 class FrameGenerationRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     request_id: str
     frames: List[FrameConfig]
     config: Optional[Dict] = None
@@ -60,6 +91,8 @@ class FrameGenerationResponse(BaseModel):
     output_directory: str
 
 class VideoGenerationRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     request_id: str
     fps: Optional[int] = 30
 
@@ -69,6 +102,8 @@ class VideoGenerationResponse(BaseModel):
     output_directory: str
 
 class CombinedVideoGenerationRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     request_id: str
     fps: Optional[int] = 30
     transition_duration: Optional[float] = 0.5  # Duration of transition between sequences in seconds
@@ -81,23 +116,70 @@ class CombinedVideoGenerationResponse(BaseModel):
 # Initialize job status manager
 job_status_manager = JobStatusManager()
 
-def get_output_directory(request_id: str):
-    """Create and return an output directory structure using request ID"""
-    parent_dir = os.path.join(os.getcwd(), "generated_images")
-    os.makedirs(parent_dir, exist_ok=True)
-    
-    # Create request-specific directory
-    output_dir = os.path.join(parent_dir, request_id)
-    os.makedirs(output_dir, exist_ok=True)
-    
-    return output_dir
+# Default frame generation configuration, overridden per request by `config`
+DEFAULT_FRAME_CONFIG = {
+    "from": "#000000",
+    "to": "#ff0000",
+    "fps": 30,
+    "width": 1080,
+    "height": 1920,
+    "animation": "color",
+    "hold_duration": 1.5,  # Duration to hold the complete image at the end
+    "format": "png"  # "png" writes a frame sequence, "mp4" encodes the frames straight to a video
+}
+
+# Animation types that recolor elements as they are revealed
+COLOR_ANIMATIONS = frozenset({"color", "both"})
+
+# Upper bound on concurrent rsvg-convert/ffmpeg render jobs; excess jobs queue
+# here instead of oversubscribing the CPU
+MAX_RENDER_WORKERS = int(os.getenv("MAX_RENDER_WORKERS", max(2, os.cpu_count() or 2)))
+render_semaphore = asyncio.Semaphore(MAX_RENDER_WORKERS)
+
+# Shared pool for per-frame rendering. The heavy lifting happens in librsvg/cairo
+# (which release the GIL) or rsvg-convert subprocesses, so threads keep MAX_RENDER_WORKERS cores busy
+frame_executor = ThreadPoolExecutor(max_workers=MAX_RENDER_WORKERS, thread_name_prefix="frame-render")
+
+# Distinct frames per run when piping to ffmpeg. Each sequence keeps at most
+# MAX_RENDER_WORKERS runs in flight, so at most MAX_RENDER_WORKERS * PIPE_RUN_FRAMES
+# encoded PNGs are held in memory before ffmpeg consumes them
+PIPE_RUN_FRAMES = 8
+
+# Upper bound on in-flight Replicate predictions across all jobs, to stay clear of 429s
+REPLICATE_CONCURRENCY = int(os.getenv("REPLICATE_CONCURRENCY", 8))
+replicate_semaphore = asyncio.Semaphore(REPLICATE_CONCURRENCY)
+
+# How long idle connections to Replicate stay open; httpx's 5s default drops them
+# between jobs, so every batch of prompts would start with fresh TLS handshakes
+REPLICATE_KEEPALIVE_EXPIRY = 60.0
+
+# Attempts for a prediction create that is rate limited. The SDK only retries
+# idempotent requests, but a 429'd POST never created a prediction, so it is safe
+# to resend after the Retry-After delay (or 1s, 2s, 4s, ... without one)
+REPLICATE_CREATE_ATTEMPTS = 5
+
+# The Replicate client is thread-safe and shared by all prompts. Its pool keeps one
+# connection per concurrent prediction alive so creates, polls and downloads reuse them
+replicate_client = replicate.Client(
+    api_token=get_settings().replicate_api_token,
+    transport=RetryTransport(
+        httpx.HTTPTransport(
+            limits=httpx.Limits(
+                max_connections=REPLICATE_CONCURRENCY * 2,
+                max_keepalive_connections=REPLICATE_CONCURRENCY,
+                keepalive_expiry=REPLICATE_KEEPALIVE_EXPIRY
+            )
+        ),
+        max_attempts=REPLICATE_CREATE_ATTEMPTS,
+        backoff_factor=1.0,
+        retryable_methods=["POST"],
+        retry_status_codes=[429]
+    )
+)
 
 def generate_single_svg(prompt: str, output_dir: str, index: int) -> SVGGenerationResult:
     """Generate a single SVG image for a prompt"""
     try:
-        # Configure Replicate
-        replicate.api_token = os.getenv("REPLICATE_API_TOKEN")
-        
         # Generate the SVG
         input = {
             "prompt": prompt,
@@ -105,7 +187,7 @@ def generate_single_svg(prompt: str, output_dir: str, index: int) -> SVGGenerati
             "style": "vector_illustration/doodle_line_art",
         }
         
-        output = replicate.run(
+        output = replicate_client.run(
             "recraft-ai/recraft-20b-svg",
             input=input
         )
@@ -113,7 +195,9 @@ def generate_single_svg(prompt: str, output_dir: str, index: int) -> SVGGenerati
         # Save the SVG file with sequential numbering
         svg_path = os.path.join(output_dir, f"output_{index:03d}.svg")
         with open(svg_path, "wb") as file:
-            file.write(output.read())
+            # Stream the download to disk chunk by chunk instead of buffering it whole
+            for chunk in output:
+                file.write(chunk)
         
         logger.info(f"SVG saved successfully to {svg_path}")
         
@@ -142,17 +226,17 @@ async def process_svg_generation(
     try:
         logger.info(f"Starting SVG generation for job {job_id}")
         
-        # Generate SVGs for each prompt
-        for i, prompt in enumerate(prompts):
-            logger.info(f"Processing prompt {i+1}/{len(prompts)}")
-            result = await asyncio.to_thread(
-                generate_single_svg,
-                prompt=prompt,
-                output_dir=output_dir,
-                index=i
-            )
+        async def generate_prompt(i: int, prompt: str) -> None:
+            async with replicate_semaphore:
+                logger.info(f"Processing prompt {i+1}/{len(prompts)}")
+                result = await asyncio.to_thread(
+                    generate_single_svg,
+                    prompt=prompt,
+                    output_dir=output_dir,
+                    index=i
+                )
             
-            # Update job status with result
+            # Update job status with result as soon as each prompt finishes
             frame_result = FrameResult(
                 id=str(i),
                 success=result.success,
@@ -160,6 +244,9 @@ async def process_svg_generation(
             )
             job_status_manager.update_job(job_id, frame_result)
         
+        # Generate SVGs for all prompts concurrently
+        await asyncio.gather(*(generate_prompt(i, prompt) for i, prompt in enumerate(prompts)))
+        
         logger.info("All SVGs generated successfully")
         job_status_manager.update_job_status(job_id, "completed")
             
@@ -171,7 +258,8 @@ async def process_svg_generation(
 @router.post("/generate", response_model=SVGGenerationResponse)
 async def generate_svgs(
     request: SVGGenerationRequest,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    settings: Settings = Depends(get_settings)
 ):
     """
     Generate SVG images from a list of prompts using Replicate's recraft-ai model.
@@ -188,7 +276,7 @@ async def generate_svgs(
             raise HTTPException(status_code=400, detail="No prompts provided")
         
         # Check if API key is set in environment
-        if not os.getenv("REPLICATE_API_TOKEN"):
+        if not settings.replicate_api_token:
             logger.error("REPLICATE_API_TOKEN environment variable not set")
             raise HTTPException(
                 status_code=500,
@@ -232,51 +320,96 @@ async def generate_svgs(
         logger.error(error_message)
         raise HTTPException(status_code=500, detail=error_message)
 
+RGB_COLOR_RE = re.compile(r"rgb\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)")
+
+@lru_cache(maxsize=4096)
 def parse_color(color_str: str) -> str:
-    """Parse color string to hex format"""
-    if color_str.startswith("#"):
-        return color_str
-    elif color_str.startswith("rgb("):
-        rgb_values = color_str[4:-1].split(",")
-        r, g, b = map(int, rgb_values)
+    """Parse color string to hex format; SVGs reuse a handful of fills, so results are cached"""
+    match = RGB_COLOR_RE.fullmatch(color_str)
+    if match:
+        r, g, b = map(int, match.groups())
         return f"#{r:02x}{g:02x}{b:02x}"
-    else:
-        return color_str
+    return color_str
+
+# sRGB <-> linear-light lookup tables. Colors are mixed in linear light; mixing the
+# gamma-encoded values directly makes intermediate colors too dark and muddy
+SRGB_TO_LINEAR = tuple(
+    c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+    for c in (i / 255 for i in range(256))
+)
+LINEAR_LUT_SIZE = 4096
+LINEAR_TO_SRGB = tuple(
+    round(255 * (v * 12.92 if v <= 0.0031308 else 1.055 * v ** (1 / 2.4) - 0.055))
+    for v in (i / (LINEAR_LUT_SIZE - 1) for i in range(LINEAR_LUT_SIZE))
+)
+
+# Two-digit lowercase hex for every channel value, so building a color is a lookup and a join
+HEX_BYTE = tuple(f"{i:02x}" for i in range(256))
+
+def mix_channel(start: int, end: int, progress: float) -> int:
+    """Mix two 0-255 sRGB channel values in linear light"""
+    start_linear = SRGB_TO_LINEAR[start]
+    linear = start_linear + (SRGB_TO_LINEAR[end] - start_linear) * progress
+    return LINEAR_TO_SRGB[round(linear * (LINEAR_LUT_SIZE - 1))]
 
 def interpolate_color(from_color: str, to_color: str, progress: float) -> str:
     """Interpolate between two colors based on progress (0-1)"""
-    from_r = int(from_color[1:3], 16)
-    from_g = int(from_color[3:5], 16)
-    from_b = int(from_color[5:7], 16)
-    
-    to_r = int(to_color[1:3], 16)
-    to_g = int(to_color[3:5], 16)
-    to_b = int(to_color[5:7], 16)
-    
-    r = int(from_r + (to_r - from_r) * progress)
-    g = int(from_g + (to_g - from_g) * progress)
-    b = int(from_b + (to_b - from_b) * progress)
-    
-    return f"#{r:02x}{g:02x}{b:02x}"
+    from_rgb = [int(from_color[k:k + 2], 16) for k in (1, 3, 5)]
+    to_rgb = [int(to_color[k:k + 2], 16) for k in (1, 3, 5)]
+    return "#" + "".join(HEX_BYTE[mix_channel(start, end, progress)] for start, end in zip(from_rgb, to_rgb))
+
+def interpolate_colors(from_color: str, to_color: str, steps: int) -> List[str]:
+    """Return interpolate_color(from_color, to_color, i / steps) for every i in range(steps)"""
+    from_rgb = [int(from_color[k:k + 2], 16) for k in (1, 3, 5)]
+    to_rgb = [int(to_color[k:k + 2], 16) for k in (1, 3, 5)]
+    # Interpolate each channel across all steps at once, then zip the channels into hex strings
+    channels = [
+        [HEX_BYTE[mix_channel(start, end, i / steps)] for i in range(steps)]
+        for start, end in zip(from_rgb, to_rgb)
+    ]
+    return [f"#{r}{g}{b}" for r, g, b in zip(*channels)]
 
 def load_svg(svg_path: str) -> etree._ElementTree:
     """Load SVG file and return its tree"""
     return etree.parse(svg_path)
 
-def save_svg(svg_tree: etree._ElementTree, output_path: str):
-    """Save SVG tree to file"""
-    svg_tree.write(output_path, pretty_print=True)
+def render_svg_in_process(svg_data: bytes, output: Union[str, io.BytesIO], width: int, height: int):
+    """Convert SVG data to PNG with librsvg and cairo, stretching it to width x height like rsvg-convert -w -h"""
+    handle = Rsvg.Handle.new_from_data(svg_data)
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+    context = cairo.Context(surface)
+
+    viewport = Rsvg.Rectangle()
+    viewport.x, viewport.y = 0, 0
+    has_size, svg_width, svg_height = handle.get_intrinsic_size_in_pixels()
+    if has_size and svg_width > 0 and svg_height > 0:
+        context.scale(width / svg_width, height / svg_height)
+        viewport.width, viewport.height = svg_width, svg_height
+    else:
+        viewport.width, viewport.height = width, height
+
+    handle.render_document(context, viewport)
+    surface.write_to_png(output)
+
+def svg_to_png(svg_data: bytes, output_path: Optional[str], width: int, height: int) -> Optional[bytes]:
+    """Convert SVG data to PNG with specified dimensions using librsvg, or rsvg-convert fed over stdin.
 
-def svg_to_png(svg_path: str, output_path: str, width: int, height: int):
-    """Convert SVG to PNG with specified dimensions using rsvg-convert"""
+    With output_path=None the PNG is returned instead of written to disk.
+    """
     try:
-        subprocess.run([
+        if Rsvg is not None:
+            output = output_path or io.BytesIO()
+            render_svg_in_process(svg_data, output, width, height)
+            return None if output_path else output.getvalue()
+        output_args = ["-o", output_path] if output_path else []
+        result = subprocess.run([
             "rsvg-convert",
-            svg_path,
             "-w", str(width),
             "-h", str(height),
-            "-o", output_path
-        ], check=True)
+            *output_args,
+            "-"
+        ], input=svg_data, stdout=subprocess.PIPE, check=True)
+        return None if output_path else result.stdout
     except subprocess.CalledProcessError as e:
         logger.error(f"Error converting SVG to PNG: {str(e)}")
         raise
@@ -284,50 +417,81 @@ def svg_to_png(svg_path: str, output_path: str, width: int, height: int):
         logger.error(f"Unexpected error converting SVG to PNG: {str(e)}")
         raise
 
-def apply_global_color_morph(svg_tree, from_color, to_color, frame, total_frames):
-    """Apply color morphing to SVG elements"""
-    progress = frame / total_frames
-
-    for elem in svg_tree.iter():
-        fill = elem.get("fill")
-        if fill:
-            current_color = parse_color(fill)
-            if current_color.startswith("#") and current_color != "#fefefe":
-                new_color = interpolate_color(from_color, to_color, progress)
-                elem.set("fill", new_color)
-
-def apply_sequential_reveal(svg_tree, frame, total_frames):
-    """Apply sequential reveal animation to SVG elements"""
-    paths = [elem for elem in svg_tree.iter() if elem.tag.endswith('path') and 
-             elem.get("fill") != "rgb(254,254,254)"]
-    
-    total_shapes = len(paths)
-    shapes_per_frame = total_shapes / total_frames
-    visible_shapes = int(frame * shapes_per_frame)
-    
-    for path in paths:
-        path.set("opacity", "0")
-    
-    for i in range(visible_shapes):
-        if i < len(paths):
-            paths[i].set("opacity", "1")
+# Paths that take part in the reveal, in document order; the near-white background
+# shapes are left alone. Matched by local name so SVGs with or without the SVG
+# namespace both work
+ANIMATED_PATHS = etree.XPath("//*[local-name()='path' and not(@fill='rgb(254,254,254)')]")
+
+def render_frames(
+    original_svg: etree._ElementTree,
+    keys: List[Tuple[int, bool]],
+    reveal_fills: Optional[List[str]],
+    hold_fills: Optional[List[str]],
+    output_paths: List[Optional[str]],
+    width: int,
+    height: int
+) -> List[Optional[bytes]]:
+    """Render a run of frames, given as (visible_elements, hold) keys, on a single working copy of the SVG.
+
+    Keys must be in playback order: visible counts never decrease and a hold
+    frame comes last. original_svg must have every animated path hidden. Each
+    frame then only reveals (and recolors) the paths added since the previous one.
+    """
+    # Work on a private copy; the parsed original is shared by all runs
+    svg_tree = copy.deepcopy(original_svg)
+    paths = ANIMATED_PATHS(svg_tree)
+    revealed = 0
+
+    results = []
+    for (visible_elements, hold), output_path in zip(keys, output_paths):
+        fills = hold_fills if hold else reveal_fills
+        # Hold frames recolor every path with the final color, not just the new ones
+        for j in range(0 if hold else revealed, visible_elements):
+            elem = paths[j]
+            elem.set("opacity", "1")
+            if fills is not None:
+                elem.set("fill", fills[j])
+        revealed = visible_elements
+
+        results.append(svg_to_png(etree.tostring(svg_tree), output_path, width, height))
+    return results
 
-def generate_frames_for_svg(svg_path: str, output_dir: str, duration: float, config: Dict) -> bool:
-    """Generate frames for a single SVG"""
+def iter_rendered(render: Callable[[List[Tuple[int, bool]]], List[Optional[bytes]]], runs: List[List[Tuple[int, bool]]]) -> Iterator[Optional[bytes]]:
+    """Render runs in parallel on frame_executor and yield their frames in order.
+
+    At most MAX_RENDER_WORKERS runs are in flight, so memory stays bounded however
+    slowly the consumer reads; runs not yet started are cancelled if it stops early.
+    """
+    remaining = iter(runs)
+    pending = deque(frame_executor.submit(render, run) for run in itertools.islice(remaining, MAX_RENDER_WORKERS))
+    try:
+        while pending:
+            pngs = pending.popleft().result()
+            for run in itertools.islice(remaining, 1):
+                pending.append(frame_executor.submit(render, run))
+            yield from pngs
+    finally:
+        for future in pending:
+            future.cancel()
+
+def link_frame(source_path: str, output_path: str) -> None:
+    """Reuse an already rendered frame, hard-linking it when the filesystem allows"""
+    try:
+        os.link(source_path, output_path)
+    except OSError:
+        shutil.copyfile(source_path, output_path)
+
+def generate_frames_for_svg(
+    svg_path: str,
+    output_dir: str,
+    duration: float,
+    config: Dict,
+    video_path: Optional[str] = None
+) -> bool:
+    """Generate frames for a single SVG; with video_path they are encoded straight to that MP4 instead"""
     try:
-        # Default configuration
-        default_config = {
-            "from": "#000000",
-            "to": "#ff0000",
-            "fps": 30,
-            "width": 1080,
-            "height": 1920,
-            "animation": "color",
-            "hold_duration": 1.5  # Duration to hold the complete image at the end
-        }
-        
         # Merge with provided config
-        merged_config = {**default_config, **(config or {})}
+        merged_config = {**DEFAULT_FRAME_CONFIG, **(config or {})}
         
         from_color = parse_color(merged_config["from"])
         to_color = parse_color(merged_config["to"])
@@ -349,66 +513,88 @@ def generate_frames_for_svg(svg_path: str, output_dir: str, duration: float, con
         
         logger.info(f"Generating {total_frames} frames: {animation_frames} animation frames + {hold_frames} hold frames")
         
-        # Load the original SVG and get all elements
+        # Parse the SVG once; each frame renders from a copy of it
         original_svg = load_svg(svg_path)
-        elements = [elem for elem in original_svg.iter() if elem.tag.endswith('path') and elem.get("fill") != "rgb(254,254,254)"]
-        total_elements = len(elements)
+        animated_paths = ANIMATED_PATHS(original_svg)
+        total_elements = len(animated_paths)
+        # Every frame starts from all paths hidden and only reveals its visible prefix
+        for elem in animated_paths:
+            elem.set("opacity", "0")
         logger.info(f"Found {total_elements} elements in SVG")
         
-        # Generate animation frames only if animation_frames > 0
+        # Animation frames reveal elements progressively; hold frames show the complete image
         if animation_frames > 0:
             # Calculate elements per frame
             elements_per_frame = total_elements / animation_frames
             logger.info(f"Elements per frame: {elements_per_frame}")
-
-            for frame in range(animation_frames):
-                svg_tree = load_svg(svg_path)
-                visible_elements = int(frame * elements_per_frame)
-                
-                # Process each element
-                for i, elem in enumerate(svg_tree.iter()):
-                    if elem.tag.endswith('path') and elem.get("fill") != "rgb(254,254,254)":
-                        # Set visibility based on frame
-                        if i < visible_elements:
-                            elem.set("opacity", "1")
-                            if animation in ['color', 'both']:
-                                # Calculate color progress
-                                color_progress = min(1.0, i / total_elements)
-                                new_color = interpolate_color(from_color, to_color, color_progress)
-                                elem.set("fill", new_color)
-                        else:
-                            elem.set("opacity", "0")
-                
-                tmp_svg = os.path.join(output_dir, 'tmp.svg')
-                save_svg(svg_tree, tmp_svg)
-                output_path = os.path.join(output_dir, f'frame_{frame:04d}.png')
-                svg_to_png(tmp_svg, output_path, width, height)
         else:
             logger.info("Skipping animation frames generation as animation_frames is 0 or less.")
-        
-        # Generate hold frames (complete image without changes)
         logger.info(f"Generating {hold_frames} hold frames")
-        for frame in range(hold_frames):
-            # Use the last animation frame as the base for hold frames
-            svg_tree = load_svg(svg_path)
-            
-            # Make all elements visible with final color
-            for elem in svg_tree.iter():
-                if elem.tag.endswith('path') and elem.get("fill") != "rgb(254,254,254)":
-                    elem.set("opacity", "1")
-                    if animation in ['color', 'both']:
-                        elem.set("fill", to_color)
-            
-            tmp_svg = os.path.join(output_dir, 'tmp.svg')
-            save_svg(svg_tree, tmp_svg)
-            # Adjust frame numbering if there were no animation frames
-            frame_index = frame if animation_frames <= 0 else frame + animation_frames
-            output_path = os.path.join(output_dir, f'frame_{frame_index:04d}.png')
-            svg_to_png(tmp_svg, output_path, width, height)
-        
-        # Clean up temporary file
-        if os.path.exists(tmp_svg):
-            os.remove(tmp_svg)
+
+        # Fills are the same for every frame, so compute them once: while revealing, each path
+        # is colored by its place in the reveal order; hold frames use the final color
+        if animation in COLOR_ANIMATIONS:
+            reveal_fills = interpolate_colors(from_color, to_color, total_elements)
+            hold_fills = [to_color] * total_elements
+        else:
+            reveal_fills = hold_fills = None
+
+        frame_paths = [os.path.join(output_dir, f'frame_{frame:04d}.png') for frame in range(total_frames)]
+
+        # A frame is fully determined by how many paths are visible and whether it is a hold frame
+        frame_keys = [
+            (int(frame * elements_per_frame), False) if frame < animation_frames else (total_elements, True)
+            for frame in range(total_frames)
+        ]
+        # Identical frames (every hold frame, and reveal frames while fewer than one path is added
+        # per frame) are rendered once and the rest are linked to the first one
+        first_frames: Dict[Tuple[int, bool], int] = {}
+        for frame, key in enumerate(frame_keys):
+            first_frames.setdefault(key, frame)
+
+        # Split the distinct frames into contiguous runs; each run reuses a single tree and
+        # only applies what changed between consecutive frames
+        distinct_keys = list(first_frames)
+        run_length = -(-len(distinct_keys) // MAX_RENDER_WORKERS) or 1
+        if video_path:
+            # Short runs, so frames reach ffmpeg soon after they are rendered
+            run_length = min(run_length, PIPE_RUN_FRAMES)
+        runs = [distinct_keys[i:i + run_length] for i in range(0, len(distinct_keys), run_length)]
+
+        def render(run: List[Tuple[int, bool]]) -> List[Optional[bytes]]:
+            return render_frames(
+                original_svg=original_svg,
+                keys=run,
+                reveal_fills=reveal_fills,
+                hold_fills=hold_fills,
+                output_paths=[None if video_path else frame_paths[first_frames[key]] for key in run],
+                width=width,
+                height=height
+            )
+
+        if video_path:
+            if total_frames == 0:
+                logger.error(f"No frames to encode for {video_path} (duration {duration}s at {fps} fps)")
+                return False
+
+            # Identical frames are consecutive, so each distinct PNG is written as many
+            # times as it repeats and then dropped
+            repeats = [sum(1 for _ in group) for _, group in itertools.groupby(frame_keys)]
+            frames = (
+                png
+                for png, count in zip(iter_rendered(render, runs), repeats)
+                for _ in range(count)
+            )
+            logger.info(f"Encoding {len(distinct_keys)} distinct frames in {len(runs)} runs to {video_path}")
+            return run_ffmpeg(build_pipe_encode_command(fps, video_path), video_path, frames=frames)
+
+        # Runs are independent, so rasterize them in parallel
+        list(frame_executor.map(render, runs))
+        logger.info(f"Rendered {len(distinct_keys)} distinct frames in {len(runs)} runs")
+
+        for frame, key in enumerate(frame_keys):
+            if first_frames[key] != frame:
+                link_frame(frame_paths[first_frames[key]], frame_paths[frame])
         
         logger.info(f"Successfully generated {total_frames} frames")
         return True
@@ -426,6 +612,8 @@ async def generate_svg_frames(
     Generate frames from existing SVGs using the provided request_id and durations.
     The frames will be saved to a directory structure:
     /generated_images/{request_id}/frames_{id}/frame_0000.png, frame_0001.png, etc.
+    With "format": "mp4" in config they are encoded straight to
+    /generated_images/{request_id}/videos/video_{id}.mp4 instead.
     """
     try:
         logger.info(f"Starting frame generation for request_id: {request.request_id}")
@@ -436,7 +624,7 @@ async def generate_svg_frames(
             raise HTTPException(status_code=400, detail="No frames configuration provided")
         
         # Get the base directory for the request
-        base_dir = os.path.join(os.getcwd(), "generated_images", request.request_id)
+        base_dir = os.path.join(GENERATED_IMAGES_DIR, request.request_id)
         if not os.path.exists(base_dir):
             logger.error(f"Base directory not found: {base_dir}")
             raise HTTPException(status_code=404, detail="Request ID not found")
@@ -457,19 +645,19 @@ async def generate_svg_frames(
             "output_directory": base_dir
         }
         
-        # Add background tasks for each frame
-        for frame_config in request.frames:
-            logger.info(f"Adding background task for frame {frame_config.id}")
-            background_tasks.add_task(
-                process_frame_generation,
-                job_id=job_id,
-                request_id=request.request_id,
-                frame_config=frame_config,
-                config=request.config,
-                base_dir=base_dir
-            )
+        # Add a single background task that renders every sequence concurrently;
+        # separate tasks would run one after another
+        logger.info(f"Adding background task for frames {[frame_config.id for frame_config in request.frames]}")
+        background_tasks.add_task(
+            process_all_frame_generation,
+            job_id=job_id,
+            request_id=request.request_id,
+            frames=request.frames,
+            config=request.config,
+            base_dir=base_dir
+        )
         
-        logger.info("All background tasks added, returning response")
+        logger.info("Background task added, returning response")
         # Return immediately with job_id
         return response
     
@@ -503,32 +691,40 @@ async def process_frame_generation(
             job_status_manager.update_job(job_id, result)
             return
         
-        # Create frames directory (remove if exists)
         frames_dir = os.path.join(base_dir, f"frames_{frame_config.id}")
-        logger.info(f"Processing frames directory: {frames_dir}")
-        
-        if os.path.exists(frames_dir):
-            logger.info(f"Removing existing frames directory: {frames_dir}")
-            await asyncio.to_thread(shutil.rmtree, frames_dir)
-        
-        logger.info(f"Creating new frames directory: {frames_dir}")
-        await asyncio.to_thread(os.makedirs, frames_dir, exist_ok=True)
+        video_path = None
+        if (config or {}).get("format") == "mp4":
+            # Encode straight to the video /generate-videos would produce; no frames directory
+            video_path = os.path.join(base_dir, "videos", f"video_{frame_config.id}.mp4")
+            await asyncio.to_thread(os.makedirs, os.path.dirname(video_path), exist_ok=True)
+        else:
+            # Create frames directory (remove if exists)
+            logger.info(f"Processing frames directory: {frames_dir}")
+            
+            if os.path.exists(frames_dir):
+                logger.info(f"Removing existing frames directory: {frames_dir}")
+                await asyncio.to_thread(shutil.rmtree, frames_dir)
+            
+            logger.info(f"Creating new frames directory: {frames_dir}")
+            await asyncio.to_thread(os.makedirs, frames_dir, exist_ok=True)
         
         # Generate frames
         logger.info(f"Starting frame generation for SVG: {svg_path}")
-        success = await asyncio.to_thread(
-            generate_frames_for_svg,
-            svg_path=svg_path,
-            output_dir=frames_dir,
-            duration=frame_config.duration,
-            config=config
-        )
+        async with render_semaphore:
+            success = await asyncio.to_thread(
+                generate_frames_for_svg,
+                svg_path=svg_path,
+                output_dir=frames_dir,
+                duration=frame_config.duration,
+                config=config,
+                video_path=video_path
+            )
         
         logger.info(f"Frame generation completed with success={success}")
         result = FrameResult(
             id=frame_config.id,
             success=success,
-            frames_path=frames_dir if success else None,
+            frames_path=(video_path or frames_dir) if success else None,
             error=None if success else "Failed to generate frames"
         )
         
@@ -545,38 +741,181 @@ async def process_frame_generation(
         job_status_manager.update_job(job_id, result)
         logger.error(f"Updated job status with error for frame {frame_config.id}")
 
+async def process_all_frame_generation(
+    job_id: str,
+    request_id: str,
+    frames: List[FrameConfig],
+    config: Optional[Dict],
+    base_dir: str
+) -> None:
+    """Process frame generation for all SVGs of a request concurrently, bounded by render_semaphore"""
+    await asyncio.gather(*(
+        process_frame_generation(
+            job_id=job_id,
+            request_id=request_id,
+            frame_config=frame_config,
+            config=config,
+            base_dir=base_dir
+        )
+        for frame_config in frames
+    ))
+
+# Serialized job status per job ID, reused by polls until the job's updated_at changes.
+# Jobs are polled while they run and then abandoned, so entries expire an hour after
+# they are stored and the cache stays bounded instead of growing with every job
+JOB_STATUS_CACHE_SIZE = 4096
+JOB_STATUS_CACHE_TTL = 3600
+_job_status_json: "TTLCache[str, Tuple[datetime, bytes]]" = TTLCache(
+    maxsize=JOB_STATUS_CACHE_SIZE,
+    ttl=JOB_STATUS_CACHE_TTL
+)
+
 @router.get("/job-status/{job_id}", response_model=JobStatus)
 async def get_job_status(job_id: str):
     """Get the status of a background job"""
     job_status = job_status_manager.get_job(job_id)
     if not job_status:
         raise HTTPException(status_code=404, detail="Job not found")
-    return job_status
+    
+    cached = _job_status_json.get(job_id)
+    if cached is None or cached[0] != job_status.updated_at:
+        cached = (job_status.updated_at, job_status.model_dump_json().encode())
+        _job_status_json[job_id] = cached
+    return Response(cached[1], media_type="application/json")
+
+# How much of the end of an ffmpeg log to surface when an encode fails
+FFMPEG_ERROR_TAIL_BYTES = 4096
+
+def run_ffmpeg(cmd: List[str], output_path: str, frames: Optional[Iterable[bytes]] = None) -> bool:
+    """Run an ffmpeg command with its output written to a log file next to output_path.
+
+    If frames is given, each chunk is written to ffmpeg's stdin in order; if the
+    frames iterable raises, ffmpeg is killed, any partial output removed and the
+    error re-raised. The log is removed on success; on failure its tail is logged
+    and the file is kept for inspection.
+    """
+    log_path = f"{os.path.splitext(output_path)[0]}.ffmpeg.log"
+    with open(log_path, "wb") as log_file:
+        if frames is None:
+            returncode = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=log_file).returncode
+        else:
+            proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=log_file)
+            try:
+                for frame in frames:
+                    proc.stdin.write(frame)
+            except BrokenPipeError:
+                # ffmpeg exited early; its log explains why
+                pass
+            except Exception:
+                # The frame source failed; don't let ffmpeg finalize a truncated video
+                proc.kill()
+                proc.wait()
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+                raise
+            finally:
+                try:
+                    proc.stdin.close()
+                except BrokenPipeError:
+                    pass
+                returncode = proc.wait()
+    
+    if returncode != 0:
+        with open(log_path, "rb") as log_file:
+            log_file.seek(max(0, os.path.getsize(log_path) - FFMPEG_ERROR_TAIL_BYTES))
+            error_tail = log_file.read().decode("utf-8", "replace")
+        logger.error(f"FFmpeg error (full log at {log_path}): {error_tail}")
+        return False
+    
+    os.remove(log_path)
+    return True
+
+# Encoder settings shared by every frames-to-MP4 encode
+X264_ENCODE_ARGS = (
+    "-c:v", "libx264",
+    "-pix_fmt", "yuv420p",  # Required for compatibility
+    "-preset", "medium",  # Balance between speed and compression
+    "-crf", "23",  # Quality setting (0-51, lower is better)
+)
+
+# Hardware H.264 encoders tried before libx264, with settings close to -crf 23.
+# Set VIDEO_HW_ENCODE=0 to always use libx264
+HARDWARE_ENCODE_ARGS = (
+    ("-c:v", "h264_nvenc", "-pix_fmt", "yuv420p", "-preset", "p4", "-tune", "hq", "-rc", "vbr", "-cq", "23"),
+    ("-c:v", "h264_videotoolbox", "-pix_fmt", "yuv420p", "-q:v", "55"),
+)
+VIDEO_HW_ENCODE = os.getenv("VIDEO_HW_ENCODE", "1") != "0"
+
+# Serializes the first get_encode_args() call; encodes start concurrently and
+# would otherwise all run the probe encodes at once
+_encode_args_lock = threading.Lock()
+
+def get_encode_args() -> Tuple[str, ...]:
+    """Return the encoder arguments for frames-to-MP4 encodes, preferring a working hardware encoder.
+
+    The probe runs once per process; concurrent first callers wait for it
+    instead of probing in parallel.
+    """
+    with _encode_args_lock:
+        return probe_encode_args()
+
+@lru_cache(maxsize=None)
+def probe_encode_args() -> Tuple[str, ...]:
+    """Pick the encoder arguments, checking each hardware encoder with a short test encode.
+
+    ffmpeg lists encoders it was built with even when there is no device to run
+    them on. Call through get_encode_args(), which caches the result under a lock.
+    """
+    if VIDEO_HW_ENCODE:
+        for encode_args in HARDWARE_ENCODE_ARGS:
+            try:
+                probe = subprocess.run([
+                    "ffmpeg", "-v", "error",
+                    "-f", "lavfi", "-i", "color=size=256x256:duration=0.1",
+                    *encode_args,
+                    "-f", "null", "-"
+                ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30)
+            except (OSError, subprocess.TimeoutExpired):
+                continue
+            if probe.returncode == 0:
+                logger.info(f"Encoding videos with {encode_args[1]}")
+                return encode_args
+    logger.info("Encoding videos with libx264")
+    return X264_ENCODE_ARGS
+
+def build_encode_command(frames_dir: str, fps: int, output_path: str) -> List[str]:
+    """Build the ffmpeg command that encodes frame_%04d.png in frames_dir to an MP4"""
+    return [
+        "ffmpeg",
+        "-y",  # Overwrite output file if exists
+        "-nostats",  # Keep the log to warnings/errors; success is judged by the exit code
+        "-framerate", str(fps),
+        "-i", os.path.join(frames_dir, "frame_%04d.png"),
+        *get_encode_args(),
+        output_path
+    ]
+
+def build_pipe_encode_command(fps: int, output_path: str) -> List[str]:
+    """Build the ffmpeg command that encodes PNG frames piped to stdin to an MP4"""
+    return [
+        "ffmpeg",
+        "-y",
+        "-nostats",
+        "-f", "image2pipe",
+        "-framerate", str(fps),
+        "-i", "-",
+        *get_encode_args(),
+        output_path
+    ]
 
 def generate_video_from_frames(frames_dir: str, output_path: str, fps: int) -> bool:
     """Generate a video from a sequence of frames using ffmpeg"""
     try:
         # Construct ffmpeg command
-        cmd = [
-            "ffmpeg",
-            "-y",  # Overwrite output file if exists
-            "-framerate", str(fps),
-            "-i", os.path.join(frames_dir, "frame_%04d.png"),
-            "-c:v", "libx264",
-            "-pix_fmt", "yuv420p",  # Required for compatibility
-            "-preset", "medium",  # Balance between speed and compression
-            "-crf", "23",  # Quality setting (0-51, lower is better)
-            output_path
-        ]
+        cmd = build_encode_command(frames_dir, fps, output_path)
         
         # Run ffmpeg
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            logger.error(f"FFmpeg error: {result.stderr}")
-            return False
-            
-        return True
+        return run_ffmpeg(cmd, output_path)
     except Exception as e:
         logger.error(f"Error generating video: {str(e)}")
         return False
@@ -603,25 +942,28 @@ async def process_video_generation(
             job_status_manager.set_job_error(job_id, "No frame directories found")
             return
         
-        total_success = True
-        for frame_dir in frame_dirs:
+        async def encode_sequence(frame_dir: str) -> bool:
             frames_path = os.path.join(base_dir, frame_dir)
             sequence_id = frame_dir.replace("frames_", "")
             output_path = os.path.join(videos_dir, f"video_{sequence_id}.mp4")
             
             logger.info(f"Generating video for sequence {sequence_id}")
-            success = await asyncio.to_thread(
-                generate_video_from_frames,
-                frames_path,
-                output_path,
-                fps
-            )
+            async with render_semaphore:
+                success = await asyncio.to_thread(
+                    generate_video_from_frames,
+                    frames_path,
+                    output_path,
+                    fps
+                )
             
             if not success:
-                total_success = False
                 logger.error(f"Failed to generate video for sequence {sequence_id}")
+            return success
+        
+        # Sequences are independent, so encode them concurrently; render_semaphore bounds the ffmpeg processes
+        results = await asyncio.gather(*(encode_sequence(frame_dir) for frame_dir in frame_dirs))
         
-        if total_success:
+        if all(results):
             logger.info("All videos generated successfully")
             job_status_manager.update_job_status(job_id, "completed")
         else:
@@ -647,7 +989,7 @@ async def generate_videos(
         logger.info(f"Starting video generation for request_id: {request.request_id}")
         
         # Get the base directory for the request
-        base_dir = os.path.join(os.getcwd(), "generated_images", request.request_id)
+        base_dir = os.path.join(GENERATED_IMAGES_DIR, request.request_id)
         if not os.path.exists(base_dir):
             logger.error(f"Base directory not found: {base_dir}")
             raise HTTPException(status_code=404, detail="Request ID not found")
@@ -685,17 +1027,43 @@ async def generate_videos(
         logger.error(error_message)
         raise HTTPException(status_code=500, detail=error_message)
 
+def build_concat_encode_command(frames_dirs: List[str], fps: int, output_path: str) -> List[str]:
+    """Build the ffmpeg command that encodes the frame_%04d.png sequences of frames_dirs back to back into one MP4.
+
+    The concat filter needs every input at the same size and SAR, and each SVG
+    can have its own viewBox, so every sequence is fitted (letterboxed) to the
+    size of the first sequence's first frame.
+    """
+    with Image.open(os.path.join(frames_dirs[0], "frame_0000.png")) as first_frame:
+        width, height = first_frame.size
+
+    inputs = []
+    filters = []
+    for i, frames_dir in enumerate(frames_dirs):
+        inputs += ["-framerate", str(fps), "-i", os.path.join(frames_dir, "frame_%04d.png")]
+        filters.append(
+            f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1[v{i}]"
+        )
+    streams = "".join(f"[v{i}]" for i in range(len(frames_dirs)))
+    filters.append(f"{streams}concat=n={len(frames_dirs)}:v=1:a=0[v]")
+    return [
+        "ffmpeg",
+        "-y",
+        "-nostats",
+        *inputs,
+        "-filter_complex", ";".join(filters),
+        "-map", "[v]",
+        *get_encode_args(),
+        output_path
+    ]
+
 def generate_combined_video(frames_dirs: List[str], output_path: str, fps: int, transition_duration: float) -> bool:
     """Generate a single video combining all frame sequences"""
     try:
         logger.info(f"Starting combined video generation with {len(frames_dirs)} frame directories")
         logger.info(f"FPS: {fps}")
         
-        # Create a temporary directory for the concatenated frames
-        temp_dir = os.path.join(os.path.dirname(output_path), "temp_frames")
-        os.makedirs(temp_dir, exist_ok=True)
-        logger.info(f"Created temporary directory: {temp_dir}")
-        
         # Sort frame directories numerically
         def get_frame_number(dir_path):
             dir_name = os.path.basename(dir_path)
@@ -704,50 +1072,28 @@ def generate_combined_video(frames_dirs: List[str], output_path: str, fps: int,
         sorted_frames_dirs = sorted(frames_dirs, key=get_frame_number)
         logger.info(f"Sorted frame directories: {[os.path.basename(d) for d in sorted_frames_dirs]}")
         
-        # Process each sequence and copy frames to temp directory
-        all_frames = []
-        frame_count = 0
+        # Sequences are fed to ffmpeg in place and joined with the concat filter;
+        # empty sequences would fail to open as inputs, so they are left out
+        sequences = []
+        total_frames = 0
         for i, frames_dir in enumerate(sorted_frames_dirs):
-            logger.info(f"Processing sequence {i+1} from directory: {frames_dir}")
-            
-            # Get all frames in the directory and sort them
-            frames = sorted([f for f in os.listdir(frames_dir) if f.startswith('frame_') and f.endswith('.png')])
-            logger.info(f"Found {len(frames)} frames in sequence {i+1}")
-            
-            # Copy frames to temp directory with new sequential numbering
-            for frame in frames:
-                frame_path = os.path.join(frames_dir, frame)
-                new_frame_name = f"frame_{frame_count:04d}.png"
-                new_frame_path = os.path.join(temp_dir, new_frame_name)
-                shutil.copy2(frame_path, new_frame_path)
-                all_frames.append(new_frame_path)
-                frame_count += 1
-                logger.debug(f"Copied frame: {frame_path} -> {new_frame_path}")
-        
-        logger.info(f"Total frames in final video: {len(all_frames)}")
+            frame_count = sum(1 for f in os.listdir(frames_dir) if f.startswith('frame_') and f.endswith('.png'))
+            logger.info(f"Found {frame_count} frames in sequence {i+1}")
+            if frame_count:
+                sequences.append(frames_dir)
+                total_frames += frame_count
+        
+        if not sequences:
+            logger.error("No frames found in any sequence")
+            return False
+        
+        logger.info(f"Total frames in final video: {total_frames}")
         
         # Use ffmpeg to create the final video
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-framerate", str(fps),
-            "-i", os.path.join(temp_dir, "frame_%04d.png"),
-            "-c:v", "libx264",
-            "-pix_fmt", "yuv420p",
-            "-preset", "medium",
-            "-crf", "23",
-            output_path
-        ]
+        cmd = build_concat_encode_command(sequences, fps, output_path)
         
         logger.info("Starting final video generation with ffmpeg")
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        # Clean up temporary files
-        shutil.rmtree(temp_dir)
-        logger.info("Cleaned up temporary files")
-        
-        if result.returncode != 0:
-            logger.error(f"FFmpeg error: {result.stderr}")
+        if not run_ffmpeg(cmd, output_path):
             return False
             
         logger.info(f"Successfully generated combined video: {output_path}")
@@ -781,13 +1127,14 @@ async def process_combined_video_generation(
         
         # Generate the combined video
         output_path = os.path.join(videos_dir, "combined_video.mp4")
-        success = await asyncio.to_thread(
-            generate_combined_video,
-            frame_dirs,
-            output_path,
-            fps,
-            transition_duration
-        )
+        async with render_semaphore:
+            success = await asyncio.to_thread(
+                generate_combined_video,
+                frame_dirs,
+                output_path,
+                fps,
+                transition_duration
+            )
         
         if success:
             logger.info("Combined video generated successfully")
@@ -815,7 +1162,7 @@ async def generate_combined_video_endpoint(
         logger.info(f"Starting combined video generation for request_id: {request.request_id}")
         
         # Get the base directory for the request
-        base_dir = os.path.join(os.getcwd(), "generated_images", request.request_id)
+        base_dir = os.path.join(GENERATED_IMAGES_DIR, request.request_id)
         if not os.path.exists(base_dir):
             logger.error(f"Base directory not found: {base_dir}")
             raise HTTPException(status_code=404, detail="Request ID not found")
@@ -861,21 +1208,24 @@ async def download_combined_video(request_id: str):
     """
     try:
         # Construct the path to the combined video file
-        base_dir = os.path.join(os.getcwd(), "generated_images", request_id)
-        video_path = os.path.join(base_dir, "videos", "combined_video.mp4")
+        video_path = os.path.join(GENERATED_IMAGES_DIR, request_id, "videos", "combined_video.mp4")
         
-        # Check if the video file exists
-        if not os.path.exists(video_path):
+        # Check if the video file exists; the stat result is reused by the response
+        stat_result = stat_file(video_path)
+        if not stat_result:
             logger.error(f"Combined video not found at path: {video_path}")
             raise HTTPException(status_code=404, detail="Combined video not found for the specified request_id")
         
         # Return the file as a downloadable response
-        return FileResponse(
+        return MediaFileResponse(
             path=video_path,
             filename=f"combined_video_{request_id}.mp4",
-            media_type="video/mp4"
+            media_type="video/mp4",
+            stat_result=stat_result
         )
             
+    except HTTPException:
+        raise
     except Exception as e:
         error_message = f"Error downloading combined video: {str(e)}"
         logger.error(error_message)
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 import os
 from typing import Optional
 from dotenv import load_dotenv
@@ -19,6 +19,8 @@ router = APIRouter(
 )
 
 class TranscriptionRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     audio_url: str
     language_code: Optional[str] = "es"  # Default to Spanish
 
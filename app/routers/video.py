@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Request, Query, Body
 from fastapi.responses import FileResponse
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, ConfigDict, HttpUrl
 import os
+import asyncio
 import logging
 from typing import Optional, List
 from app.services.video_pipeline import VideoProcessor
@@ -10,6 +11,7 @@ from app.models.video import ProcessedVideo, VideoStatusEnum
 from datetime import datetime
 import sqlite3
 from app.utils.url import get_base_url
+from app.utils.responses import MediaFileResponse, stat_file
 
 logger = logging.getLogger(__name__)
 
@@ -23,11 +25,28 @@ router = APIRouter(
 video_processor = VideoProcessor()
 video_manager = VideoManager()
 
+# Upper bound on download pipelines (yt-dlp + ffmpeg audio/collage extraction) running at once
+MAX_CONCURRENT_PIPELINES = int(os.getenv("MAX_CONCURRENT_PIPELINES", os.cpu_count() or 2))
+pipeline_semaphore = asyncio.Semaphore(MAX_CONCURRENT_PIPELINES)
+
+# Download directory for each supported platform, resolved once
+VIDEO_DIRS = {
+    "twitter": video_processor.twitter_dir,
+    "tiktok": video_processor.tiktok_dir,
+    "youtube": video_processor.youtube_dir,
+}
+
+# Served media files are addressed by video ID and filename and never change,
+# so clients may cache them for a year without revalidating
+MEDIA_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
 # Configure pipeline steps as needed
 # Example: Disable transcription
 # video_processor.enable_step("transcribe_audio", False)
 
 class VideoRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     url: HttpUrl
     language_code: Optional[str] = "es"  # Default language for transcription
     
@@ -56,18 +75,22 @@ class VideoListResponse(BaseModel):
     status: Optional[str] = None
     
 class VideoStatusUpdate(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     status: VideoStatusEnum
     
 class AIReviewUpdate(BaseModel):
     ai_review: str
     
-    class Config:
-        # Add example for documentation
-        schema_extra = {
+    # Add example for documentation
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "ai_review": "This video contains educational content with a speaker explaining technical concepts."
             }
         }
+    )
 
 @router.post("/download", response_model=VideoResponse)
 async def download_video(request: VideoRequest, request_info: Request):
@@ -80,24 +103,20 @@ async def download_video(request: VideoRequest, request_info: Request):
         logger.info(f"Received video download request for URL: {request.url}")
         logger.info(f"Language code: {request.language_code}")
         
-        # Determine platform from URL for response
-        url = str(request.url)
-        platform = "unknown"
-        if "twitter.com" in url or "x.com" in url:
-            platform = "twitter"
-        elif "tiktok.com" in url:
-            platform = "tiktok"
-        elif "youtube.com" in url or "youtu.be" in url:
-            platform = "youtube"
-        
-        logger.info(f"Detected platform: {platform}")
-        
         # Download the video through the extended pipeline
+        url = str(request.url)
         logger.info("Starting video download and processing pipeline")
-        result = video_processor.download_video_extended(url, request.language_code)
+        # The pipeline blocks on yt-dlp, ffmpeg and transcription polling; run it in a worker
+        # thread and cap how many run at once so concurrent requests don't oversubscribe the CPU
+        async with pipeline_semaphore:
+            result = await asyncio.to_thread(video_processor.download_video_extended, url, request.language_code)
         
         logger.debug(f"Pipeline result keys: {', '.join(result.keys())}")
         
+        # The pipeline already identified the platform, reuse it for the response
+        platform = result["platform"] or "unknown"
+        logger.info(f"Detected platform: {platform}")
+        
         file_path = result["video_path"]
         audio_path = result["audio_path"]
         srt_path = result["srt_path"]
@@ -117,10 +136,10 @@ async def download_video(request: VideoRequest, request_info: Request):
                 logger.warning(f"Collage path was provided but file does not exist at {collage_path}")
         
         if file_path and os.path.exists(file_path):
-            # Extract video_id and filename from the file_path
+            # Use the video_id identified by the pipeline, falling back to the filename prefix
             filename = os.path.basename(file_path)
-            video_id = filename.split('_')[0]
-            logger.info(f"Extracted video_id: {video_id} from filename: {filename}")
+            video_id = result["video_id"] or filename.split('_')[0]
+            logger.info(f"Using video_id: {video_id} for filename: {filename}")
             
             # Generate URL for the file
             base_url = get_base_url(request_info)
@@ -298,7 +317,7 @@ async def update_video_status(video_id: str, status_update: VideoStatusUpdate):
 async def update_ai_review(
     video_id: str, 
     review_update: AIReviewUpdate = Body(..., 
-        example={"ai_review": "This video contains educational content"})
+        examples=[{"ai_review": "This video contains educational content"}])
 ):
     """
     Update the AI review of a processed video.
@@ -421,7 +440,7 @@ async def get_twitter_video(video_id: str):
         if matching_files:
             # Use the most recently downloaded file if multiple exist
             video_path = os.path.join(video_dir, matching_files[0])
-            return FileResponse(
+            return MediaFileResponse(
                 path=video_path,
                 media_type="video/mp4",
                 filename=os.path.basename(video_path)
@@ -450,7 +469,7 @@ async def get_tiktok_video(video_id: str):
         if matching_files:
             # Use the most recently downloaded file if multiple exist
             video_path = os.path.join(video_dir, matching_files[0])
-            return FileResponse(
+            return MediaFileResponse(
                 path=video_path,
                 media_type="video/mp4",
                 filename=os.path.basename(video_path)
@@ -479,7 +498,7 @@ async def get_youtube_video(video_id: str):
         if matching_files:
             # Use the most recently downloaded file if multiple exist
             video_path = os.path.join(video_dir, matching_files[0])
-            return FileResponse(
+            return MediaFileResponse(
                 path=video_path,
                 media_type="video/mp4",
                 filename=os.path.basename(video_path)
@@ -501,13 +520,8 @@ async def serve_video(platform: str, video_id: str, filename: str, request: Requ
     This endpoint provides direct access to the video file.
     """
     try:
-        if platform == "twitter":
-            video_dir = video_processor.twitter_dir
-        elif platform == "tiktok":
-            video_dir = video_processor.tiktok_dir
-        elif platform == "youtube":
-            video_dir = video_processor.youtube_dir
-        else:
+        video_dir = VIDEO_DIRS.get(platform)
+        if video_dir is None:
             raise HTTPException(
                 status_code=400,
                 detail=f"Unsupported platform: {platform}"
@@ -515,15 +529,17 @@ async def serve_video(platform: str, video_id: str, filename: str, request: Requ
             
         video_path = os.path.join(video_dir, filename)
         
-        if os.path.exists(video_path) and filename.startswith(video_id):
+        stat_result = stat_file(video_path) if filename.startswith(video_id) else None
+        if stat_result:
             # Get the origin from the request headers
             origin = request.headers.get("origin")
             
             # Create response with CORS headers
-            response = FileResponse(
+            response = MediaFileResponse(
                 path=video_path,
                 media_type="video/mp4",
-                filename=filename
+                filename=filename,
+                stat_result=stat_result
             )
             
             # Add CORS headers manually
@@ -535,6 +551,7 @@ async def serve_video(platform: str, video_id: str, filename: str, request: Requ
 
             response.headers["Access-Control-Allow-Methods"] = "GET, OPTIONS"
             response.headers["Access-Control-Allow-Headers"] = "*"
+            response.headers["Cache-Control"] = MEDIA_CACHE_CONTROL
             
             return response
         else:
@@ -557,15 +574,17 @@ async def serve_audio(video_id: str, filename: str, request: Request):
         audio_dir = video_processor.audio_dir
         audio_path = os.path.join(audio_dir, filename)
         
-        if os.path.exists(audio_path) and filename.startswith(video_id):
+        stat_result = stat_file(audio_path) if filename.startswith(video_id) else None
+        if stat_result:
             # Get the origin from the request headers
             origin = request.headers.get("origin", "*")
             
             # Create response with CORS headers
-            response = FileResponse(
+            response = MediaFileResponse(
                 path=audio_path,
                 media_type="audio/mpeg",
-                filename=filename
+                filename=filename,
+                stat_result=stat_result
             )
             
             # Add CORS headers manually
@@ -573,6 +592,7 @@ async def serve_audio(video_id: str, filename: str, request: Request):
             response.headers["Access-Control-Allow-Credentials"] = "true"
             response.headers["Access-Control-Allow-Methods"] = "GET, OPTIONS"
             response.headers["Access-Control-Allow-Headers"] = "*"
+            response.headers["Cache-Control"] = MEDIA_CACHE_CONTROL
             
             return response
         else:
@@ -595,15 +615,27 @@ async def serve_transcript(video_id: str, filename: str, request: Request):
         transcript_dir = video_processor.transcripts_dir
         transcript_path = os.path.join(transcript_dir, filename)
         
-        if os.path.exists(transcript_path) and filename.startswith(video_id):
+        stat_result = stat_file(transcript_path) if filename.startswith(video_id) else None
+        if stat_result:
             # Get the origin from the request headers
             origin = request.headers.get("origin", "*")
             
+            # Serve the precompressed sibling written by the transcribe step when the client accepts gzip
+            gzip_path = f"{transcript_path}.gz"
+            headers = {"Vary": "Accept-Encoding"}
+            if "gzip" in request.headers.get("accept-encoding", ""):
+                gzip_stat_result = stat_file(gzip_path)
+                if gzip_stat_result:
+                    transcript_path, stat_result = gzip_path, gzip_stat_result
+                    headers["Content-Encoding"] = "gzip"
+            
             # Create response with CORS headers
             response = FileResponse(
                 path=transcript_path,
                 media_type="application/x-subrip",
-                filename=filename
+                filename=filename,
+                headers=headers,
+                stat_result=stat_result
             )
             
             # Add CORS headers manually
@@ -611,6 +643,7 @@ async def serve_transcript(video_id: str, filename: str, request: Request):
             response.headers["Access-Control-Allow-Credentials"] = "true"
             response.headers["Access-Control-Allow-Methods"] = "GET, OPTIONS"
             response.headers["Access-Control-Allow-Headers"] = "*"
+            response.headers["Cache-Control"] = MEDIA_CACHE_CONTROL
             
             return response
         else:
@@ -633,7 +666,8 @@ async def serve_collage(video_id: str, filename: str, request: Request):
         collage_dir = video_processor.collages_dir
         collage_path = os.path.join(collage_dir, filename)
         
-        if os.path.exists(collage_path) and filename.startswith(video_id):
+        stat_result = stat_file(collage_path) if filename.startswith(video_id) else None
+        if stat_result:
             # Get the origin from the request headers
             origin = request.headers.get("origin", "*")
             
@@ -641,7 +675,8 @@ async def serve_collage(video_id: str, filename: str, request: Request):
             response = FileResponse(
                 path=collage_path,
                 media_type="image/jpeg",
-                filename=filename
+                filename=filename,
+                stat_result=stat_result
             )
             
             # Add CORS headers manually
@@ -649,6 +684,7 @@ async def serve_collage(video_id: str, filename: str, request: Request):
             response.headers["Access-Control-Allow-Credentials"] = "true"
             response.headers["Access-Control-Allow-Methods"] = "GET, OPTIONS"
             response.headers["Access-Control-Allow-Headers"] = "*"
+            response.headers["Cache-Control"] = MEDIA_CACHE_CONTROL
             
             return response
         else:
@@ -675,7 +711,7 @@ async def get_audio(video_id: str):
         if matching_files:
             # Use the most recently created file if multiple exist
             audio_path = os.path.join(audio_dir, matching_files[0])
-            return FileResponse(
+            return MediaFileResponse(
                 path=audio_path,
                 media_type="audio/mpeg",
                 filename=os.path.basename(audio_path)
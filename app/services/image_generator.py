@@ -5,9 +5,11 @@ from PIL import Image
 from io import BytesIO
 from google import genai
 from google.genai import types
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
 import uuid
+import asyncio
+from app.utils.paths import get_output_directory
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -16,6 +18,10 @@ logger = logging.getLogger(__name__)
 TARGET_WIDTH = 1080  # Common width for 9:16 content
 TARGET_HEIGHT = 1920  # Common height for 9:16 content
 
+# Upper bound on in-flight Gemini requests across all batches
+GEMINI_CONCURRENCY = int(os.getenv("GEMINI_CONCURRENCY", 8))
+gemini_semaphore = asyncio.Semaphore(GEMINI_CONCURRENCY)
+
 def load_base_image():
     """Load the base image to use as canvas"""
     base_path = os.path.join(os.path.dirname(__file__), '..', 'assets', 'base.png')
@@ -27,38 +33,12 @@ def load_base_image():
         logger.error(f"Failed to load base image: {str(e)}")
         raise
 
-def get_api_key():
-    """Get the API key from environment variables"""
-    api_key = os.getenv("GEMINI_API_KEY")
+def get_api_key(api_key: Optional[str]):
+    """Validate the Gemini API key resolved by the caller's settings"""
     if not api_key:
         raise ValueError("GEMINI_API_KEY environment variable not set")
     return api_key
 
-def get_output_directory(request_id: str):
-    """Create and return an output directory structure using request ID"""
-    parent_dir = os.path.join(os.getcwd(), "generated_images")
-    os.makedirs(parent_dir, exist_ok=True)
-    
-    # Create request-specific directory
-    output_dir = os.path.join(parent_dir, request_id)
-    os.makedirs(output_dir, exist_ok=True)
-    
-    return output_dir
-
-def get_next_sequence_number(directory):
-    """Get the next sequence number for file naming"""
-    files = [f for f in os.listdir(directory) if f.endswith('.png') and f.startswith('image_')]
-    if not files:
-        return 1
-    sequence_numbers = []
-    for filename in files:
-        try:
-            num = int(filename.replace('image_', '').replace('.png', ''))
-            sequence_numbers.append(num)
-        except ValueError:
-            continue
-    return max(sequence_numbers) + 1 if sequence_numbers else 1
-
 def resize_to_9_16(image: Image.Image) -> Image.Image:
     """Resize image to 9:16 aspect ratio with white background
     
@@ -88,32 +68,33 @@ def resize_to_9_16(image: Image.Image) -> Image.Image:
     
     return canvas
 
-def generate_image(prompt: str, request_id: str):
+def save_image(data: bytes, filepath: str) -> None:
+    """Decode generated image bytes, resize to 9:16 and save them to filepath"""
+    image = Image.open(BytesIO(data))
+    resized_image = resize_to_9_16(image)
+    resized_image.save(filepath)
+
+async def generate_image(client: genai.Client, prompt: str, input_image: Image.Image, output_dir: str, index: int):
     """Generate an image using Gemini API and save it to the request-specific directory
     
     Args:
+        client: Gemini client shared by the batch
         prompt: Text prompt for image generation
-        request_id: Unique identifier for this request
+        input_image: Base image used as canvas
+        output_dir: Request-specific output directory
+        index: 1-based position of the prompt in the batch, used for the file name
         
     Returns:
         Tuple of (success: bool, image_path: str or None, error: str or None)
     """
     try:
-        output_dir = get_output_directory(request_id)
-        
-        api_key = get_api_key()
-        client = genai.Client(api_key=api_key)
-        
         logger.info(f"Generating image for prompt: {prompt}")
         
-        # Load the base image
-        input_image = load_base_image()
-        
         prompt_text = f"{prompt}. Keep the same minimal line doodle style portrait aspect ratio."
 
         content = [prompt_text, input_image]
         
-        response = client.models.generate_content(
+        response = await client.aio.models.generate_content(
             model="gemini-2.0-flash-exp-image-generation",
             contents=content,
             config=types.GenerateContentConfig(
@@ -130,20 +111,17 @@ def generate_image(prompt: str, request_id: str):
             logger.error("No content parts in response")
             return False, None, "No content parts in response"
         
-        seq_num = get_next_sequence_number(output_dir)
-        filename = f"image_{seq_num:03d}.png"
+        filename = f"image_{index:03d}.png"
         filepath = os.path.join(output_dir, filename)
         
         logger.info(f"Saving image to {filepath}")
         
         for part in response.candidates[0].content.parts:
             if part.text is not None:
-                print(part.text)
+                logger.debug("Model text response: %s", part.text)
             elif part.inline_data is not None:
-                image = Image.open(BytesIO((part.inline_data.data)))
-                # Resize image to 9:16 aspect ratio
-                resized_image = resize_to_9_16(image)
-                resized_image.save(filepath)
+                # Decoding, resizing and PNG encoding are CPU-bound; keep them off the event loop
+                await asyncio.to_thread(save_image, part.inline_data.data, filepath)
                 logger.info(f"Image saved successfully to {filepath}")
                 return True, filepath, None
         
@@ -157,18 +135,23 @@ def generate_image(prompt: str, request_id: str):
         logger.error(traceback.format_exc())
         return False, None, error_message
 
-async def generate_multiple_images(prompts: List[str]) -> Dict:
-    """Generate multiple images for a list of prompts
+async def generate_multiple_images(prompts: List[str], api_key: Optional[str]) -> Dict:
+    """Generate multiple images for a list of prompts concurrently
+    
+    Args:
+        prompts: Text prompts, one image per prompt
+        api_key: Gemini API key from the request's settings dependency
     
     Returns:
         Dictionary containing request_id and list of generation results
     """
     # Generate unique request ID
     request_id = str(uuid.uuid4())
+    output_dir = get_output_directory(request_id)
     
-    results = []
-    for prompt in prompts:
-        success, image_path, error = generate_image(prompt, request_id)
+    async def generate(index: int, prompt: str) -> Dict:
+        async with gemini_semaphore:
+            success, image_path, error = await generate_image(client, prompt, input_image, output_dir, index)
         result = {
             "prompt": prompt,
             "success": success,
@@ -177,10 +160,21 @@ async def generate_multiple_images(prompts: List[str]) -> Dict:
             result["image_path"] = image_path
         else:
             result["error"] = error
-        results.append(result)
+        return result
+    
+    try:
+        client = genai.Client(api_key=get_api_key(api_key))
+        input_image = load_base_image()
+    except Exception as e:
+        error_message = f"Error generating image: {str(e)}"
+        logger.error(error_message)
+        results = [{"prompt": prompt, "success": False, "error": error_message} for prompt in prompts]
+    else:
+        # Results keep the order of the prompts regardless of completion order
+        results = await asyncio.gather(*(generate(i, prompt) for i, prompt in enumerate(prompts, start=1)))
     
     return {
         "request_id": request_id,
         "results": results,
-        "output_directory": get_output_directory(request_id)
+        "output_directory": output_dir
     } 
\ No newline at end of file
@@ -1,12 +1,13 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import Dict, List, Optional
 from enum import Enum
 import logging
 from datetime import datetime
 import sqlite3
 import os
-import json
 from pathlib import Path
+from cachetools import TTLCache
+from app.utils.paths import GENERATED_IMAGES_DIR
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +23,9 @@ class FrameResult(BaseModel):
     frames_path: Optional[str] = None
     error: Optional[str] = None
 
+# Validates/serializes the stored results column in one pass through pydantic-core
+FRAME_RESULTS_ADAPTER = TypeAdapter(List[FrameResult])
+
 class JobStatus(BaseModel):
     job_id: str
     request_id: str
@@ -33,11 +37,18 @@ class JobStatus(BaseModel):
     updated_at: datetime
     error: Optional[str] = None
 
+# Jobs are polled while they run and for a short while after; older entries expire
+# so the cache stays bounded, and a job written by another process is re-read from
+# SQLite at most JOB_CACHE_TTL seconds later
+JOB_CACHE_SIZE = 4096
+JOB_CACHE_TTL = 60
+
 class JobStatusManager:
     def __init__(self):
-        db_folder = Path("generated_images")
-        db_folder.mkdir(exist_ok=True)
-        self.db_path = db_folder / "job_status.db"
+        self.db_path = Path(GENERATED_IMAGES_DIR) / "job_status.db"
+        # Write-through cache of recently read or written jobs, so status polls
+        # don't hit SQLite and re-validate all frame results
+        self._cache: "TTLCache[str, JobStatus]" = TTLCache(maxsize=JOB_CACHE_SIZE, ttl=JOB_CACHE_TTL)
         self._init_db()
     
     def _init_db(self):
@@ -65,8 +76,7 @@ class JobStatusManager:
     
     def _job_from_row(self, row) -> JobStatus:
         """Convert a database row to a JobStatus object"""
-        results_data = json.loads(row[5])
-        results = [FrameResult(**r) for r in results_data]
+        results = FRAME_RESULTS_ADAPTER.validate_json(row[5])
         
         return JobStatus(
             job_id=row[0],
@@ -104,7 +114,7 @@ class JobStatusManager:
                 job.status.value,
                 job.total_frames,
                 job.completed_frames,
-                json.dumps([r.model_dump() for r in job.results]),
+                FRAME_RESULTS_ADAPTER.dump_json(job.results).decode(),
                 job.created_at.isoformat(),
                 job.updated_at.isoformat(),
                 job.error
@@ -114,10 +124,19 @@ class JobStatusManager:
         conn.commit()
         conn.close()
         
+        self._cache[job.job_id] = job
         return job
     
     def get_job(self, job_id: str) -> Optional[JobStatus]:
         """Get a job status by ID"""
+        job = self._cache.get(job_id)
+        if job is not None:
+            return job
+        
+        return self._load_job(job_id)
+    
+    def _load_job(self, job_id: str) -> Optional[JobStatus]:
+        """Read a job from SQLite and refresh its cache entry"""
         conn = sqlite3.connect(str(self.db_path))
         cursor = conn.cursor()
         
@@ -129,11 +148,20 @@ class JobStatusManager:
         if not row:
             return None
         
-        return self._job_from_row(row)
+        job = self._job_from_row(row)
+        self._cache[job_id] = job
+        return job
+    
+    def _get_job_for_update(self, job_id: str) -> Optional[JobStatus]:
+        """Get a private copy of a job to modify; the cache is only replaced once the write succeeds"""
+        # Always start from the stored row so a stale cache entry never overwrites
+        # results another writer has added
+        job = self._load_job(job_id)
+        return job.model_copy(deep=True) if job else None
     
     def update_job(self, job_id: str, result: FrameResult) -> Optional[JobStatus]:
         """Update a job with a new frame result"""
-        job = self.get_job(job_id)
+        job = self._get_job_for_update(job_id)
         if not job:
             return None
         
@@ -159,7 +187,7 @@ class JobStatusManager:
             (
                 job.status.value,
                 job.completed_frames,
-                json.dumps([r.model_dump() for r in job.results]),
+                FRAME_RESULTS_ADAPTER.dump_json(job.results).decode(),
                 job.updated_at.isoformat(),
                 job.error,
                 job.job_id
@@ -169,11 +197,12 @@ class JobStatusManager:
         conn.commit()
         conn.close()
         
+        self._cache[job.job_id] = job
         return job
     
     def set_job_error(self, job_id: str, error: str) -> Optional[JobStatus]:
         """Set a job to failed state with an error message"""
-        job = self.get_job(job_id)
+        job = self._get_job_for_update(job_id)
         if not job:
             return None
         
@@ -197,11 +226,12 @@ class JobStatusManager:
         conn.commit()
         conn.close()
         
+        self._cache[job.job_id] = job
         return job
     
     def update_job_status(self, job_id: str, status: str) -> Optional[JobStatus]:
         """Update a job's status"""
-        job = self.get_job(job_id)
+        job = self._get_job_for_update(job_id)
         if not job:
             return None
         
@@ -226,4 +256,5 @@ class JobStatusManager:
         conn.commit()
         conn.close()
         
+        self._cache[job.job_id] = job
         return job 
\ No newline at end of file
@@ -4,6 +4,7 @@ import logging
 from typing import List, Optional, Dict
 from datetime import datetime
 from pathlib import Path
+from app.utils.paths import GENERATED_IMAGES_DIR
 from app.models.video import ProcessedVideo, VideoStatusEnum
 
 logger = logging.getLogger(__name__)
@@ -12,9 +13,7 @@ class VideoManager:
     """Manager class for handling processed videos in the database."""
     
     def __init__(self):
-        db_folder = Path("generated_images")
-        db_folder.mkdir(exist_ok=True)
-        self.db_path = db_folder / "processed_videos.db"
+        self.db_path = Path(GENERATED_IMAGES_DIR) / "processed_videos.db"
         self._init_db()
     
     def _init_db(self):
@@ -148,7 +148,7 @@ class VideoProcessor:
             language_code: The language code for transcription (default: es)
             
         Returns:
-            A dictionary containing file paths and raw SRT content
+            A dictionary containing the identified platform and video ID, file paths and raw SRT content
         """
         # Initialize the context
         context = VideoContext(url=url)
@@ -174,24 +174,18 @@ class VideoProcessor:
         
         # Initialize result dictionary
         result = {
+            "platform": context.platform,
+            "video_id": context.video_id,
             "video_path": context.video_path,
             "audio_path": context.audio_path,
             "srt_path": context.srt_path,
             "collage_path": context.collage_path,
             "transcript_text": context.transcript_text,
-            "srt_content": None,
+            # The transcribe step keeps the SRT in memory alongside the file it writes
+            "srt_content": context.transcript_srt,
             "metadata": context.metadata  # Include metadata in the result
         }
         
-        # Get SRT content if available
-        if context.srt_path and os.path.exists(context.srt_path):
-            try:
-                with open(context.srt_path, "r", encoding="utf-8") as srt_file:
-                    result["srt_content"] = srt_file.read()
-                    logger.info(f"Successfully read SRT content")
-            except Exception as e:
-                logger.error(f"Error reading SRT content: {str(e)}")
-        
         logger.info(f"Extended pipeline completed. Results include raw data and file paths: {', '.join(key for key, val in result.items() if val)}")
         
         return result
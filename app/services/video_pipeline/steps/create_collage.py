@@ -24,7 +24,7 @@ class CreateCollageStep(NonCriticalStep):
         """
         self.logger.info(f"Extracting scene frames from {video_path} with threshold {threshold}")
         extract_cmd = [
-            'ffmpeg', '-i', video_path,
+            'ffmpeg', '-nostats', '-i', video_path,
             '-vf', f"select='gt(scene,{threshold})',scale=320:180",
             '-vsync', 'vfr',
             f'{frames_dir}/frame_%03d.jpg'
@@ -46,7 +46,7 @@ class CreateCollageStep(NonCriticalStep):
         """
         self.logger.info(f"Extracting evenly spaced frames from {video_path} every {interval_seconds} seconds")
         extract_cmd = [
-            'ffmpeg', '-i', video_path,
+            'ffmpeg', '-nostats', '-i', video_path,
             '-vf', f"fps=1/{interval_seconds},scale=320:180",
             '-vsync', 'vfr',
             f'{frames_dir}/frame_%03d.jpg'
@@ -79,7 +79,7 @@ class CreateCollageStep(NonCriticalStep):
         tile_rows = (len(selected_frames) + tile_cols - 1) // tile_cols
         
         collage_cmd = [
-            'ffmpeg', '-pattern_type', 'glob', '-i', f'{frames_dir}/*.jpg',
+            'ffmpeg', '-nostats', '-pattern_type', 'glob', '-i', f'{frames_dir}/*.jpg',
             '-filter_complex', f'tile={tile_cols}x{tile_rows}',
             output_path
         ]
@@ -152,12 +152,6 @@ class CreateCollageStep(NonCriticalStep):
             self.logger.info(f"Successfully created collage at: {collage_path}")
             self.logger.info(f"Context collage_path is now set to: {context.collage_path}")
             
-            # Verify file existence
-            if os.path.exists(collage_path):
-                self.logger.info(f"Verified: Collage file exists at {collage_path}")
-            else:
-                self.logger.error(f"Error: Collage file does not exist at {collage_path}")
-            
             return context
             
         except Exception as e:
@@ -34,6 +34,7 @@ class ExtractAudioStep(BaseStep):
         self.logger.info(f"Extracting audio from {context.video_path} to {audio_path}")
         command = [
             "ffmpeg", 
+            "-nostats",  # Only warnings/errors on stderr, no per-frame progress lines
             "-i", context.video_path,
             "-vn",  # No video
             "-acodec", "libmp3lame",
@@ -3,6 +3,10 @@ from app.services.video_pipeline.context import VideoContext
 import requests
 import re
 
+# Compiled once at import; used on every pipeline run that falls through to regex extraction
+TIKTOK_NUMERIC_ID_RE = re.compile(r'(\d{19})')
+YOUTUBE_WATCH_ID_RE = re.compile(r'v=([a-zA-Z0-9_-]+)')
+
 class IdentifyPlatformStep(BaseStep):
     """Step to identify the platform from the URL and extract the video ID."""
     
@@ -51,7 +55,7 @@ class IdentifyPlatformStep(BaseStep):
             video_id = url.split('/v/')[-1].split('?')[0]
         else:
             # Try to extract with regex for numeric ID
-            match = re.search(r'(\d{19})', url)
+            match = TIKTOK_NUMERIC_ID_RE.search(url)
             if match:
                 video_id = match.group(1)
             else:
@@ -82,7 +86,7 @@ class IdentifyPlatformStep(BaseStep):
             youtube_id = url.split('/shorts/')[-1].split('?')[0]
         # Standard YouTube format: youtube.com/watch?v=VIDEO_ID
         elif "youtube.com/watch" in url:
-            match = re.search(r'v=([a-zA-Z0-9_-]+)', url)
+            match = YOUTUBE_WATCH_ID_RE.search(url)
             if match:
                 youtube_id = match.group(1)
         # Shortened youtu.be format: youtu.be/VIDEO_ID
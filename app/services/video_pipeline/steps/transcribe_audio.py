@@ -1,4 +1,5 @@
 import os
+import gzip
 import assemblyai as aai
 from dotenv import load_dotenv
 from app.services.video_pipeline.steps.base_step import BaseStep
@@ -96,6 +97,10 @@ class TranscribeAudioStep(BaseStep):
                 
                 with open(srt_path, 'w', encoding='utf-8') as f:
                     f.write(context.transcript_srt)
+                
+                # Precompressed sibling so the transcript can be served gzipped without per-request work
+                with open(f"{srt_path}.gz", 'wb') as f:
+                    f.write(gzip.compress(context.transcript_srt.encode('utf-8'), compresslevel=6))
                     
                 context.srt_path = srt_path
                 self.logger.info(f"Successfully saved transcript SRT to: {srt_path}")
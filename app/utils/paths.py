@@ -0,0 +1,17 @@
+import os
+from typing import Set
+
+# Root directory for all generated output, resolved and created once at import
+GENERATED_IMAGES_DIR = os.path.join(os.getcwd(), "generated_images")
+os.makedirs(GENERATED_IMAGES_DIR, exist_ok=True)
+
+# Output directories already created by this process; nothing in the app removes them
+_created_dirs: Set[str] = set()
+
+def get_output_directory(request_id: str) -> str:
+    """Create and return an output directory structure using request ID"""
+    output_dir = os.path.join(GENERATED_IMAGES_DIR, request_id)
+    if output_dir not in _created_dirs:
+        os.makedirs(output_dir, exist_ok=True)
+        _created_dirs.add(output_dir)
+    return output_dir
@@ -0,0 +1,26 @@
+import os
+import stat
+from typing import Optional
+from fastapi.responses import FileResponse
+
+class MediaFileResponse(FileResponse):
+    """FileResponse that streams large media files in 1 MiB chunks.
+
+    Starlette's default 64 KiB chunk size means a multi-megabyte video costs
+    hundreds of thread hops and socket writes; larger chunks amortize that
+    while keeping memory use bounded.
+    """
+
+    chunk_size = 1024 * 1024
+
+def stat_file(path: str) -> Optional[os.stat_result]:
+    """Return the stat result for a regular file, or None if it is missing.
+
+    Pass the result to FileResponse(stat_result=...) so the existence check and
+    the response headers share a single stat call.
+    """
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    return stat_result if stat.S_ISREG(stat_result.st_mode) else None
@@ -3,4 +3,8 @@ import sys
 
 # Add the project root directory to the Python path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root) 
\ No newline at end of file
+sys.path.insert(0, project_root)
+
+# Settings the app reads once at import time
+os.environ.setdefault("API_KEY", "test-api-key")
+os.environ.setdefault("ASSEMBLYAI_API_KEY", "test-assemblyai-key")
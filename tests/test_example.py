@@ -1,7 +1,8 @@
+import os
 from fastapi.testclient import TestClient
 from app.main import app
 
-client = TestClient(app)
+client = TestClient(app, headers={"x-api-key": os.environ["API_KEY"]})
 
 def test_read_items():
     response = client.get("/example/")
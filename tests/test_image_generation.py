@@ -3,33 +3,36 @@ import pytest
 from unittest.mock import patch, MagicMock
 from fastapi.testclient import TestClient
 from app.main import app
+from app.config import Settings, get_settings
 from datetime import datetime
 
-client = TestClient(app)
+client = TestClient(app, headers={"x-api-key": os.environ["API_KEY"]})
 
 @pytest.fixture
-def mock_env_api_key(monkeypatch):
-    monkeypatch.setenv("GEMINI_API_KEY", "fake_api_key")
+def mock_env_api_key():
+    app.dependency_overrides[get_settings] = lambda: Settings(gemini_api_key="fake_api_key")
+    yield
+    app.dependency_overrides.pop(get_settings, None)
 
 @pytest.fixture
 def mock_date_dir():
     date_str = datetime.now().strftime("%Y-%m-%d")
     return os.path.join("generated_images", date_str)
 
-@patch("app.services.image_generator.generate_multiple_images")
-@patch("app.services.image_generator.get_output_directory")
-def test_generate_images_endpoint(mock_get_dir, mock_generate, mock_env_api_key, mock_date_dir):
-    # Mock the output directory
-    mock_get_dir.return_value = mock_date_dir
-    
+@patch("app.routers.image_generation.generate_multiple_images")
+def test_generate_images_endpoint(mock_generate, mock_env_api_key, mock_date_dir):
     # Mock the service response
-    mock_generate.return_value = [
-        {
-            "prompt": "A test prompt",
-            "success": True,
-            "image_path": os.path.join(mock_date_dir, "image_001.png")
-        }
-    ]
+    mock_generate.return_value = {
+        "request_id": "test-request",
+        "results": [
+            {
+                "prompt": "A test prompt",
+                "success": True,
+                "image_path": os.path.join(mock_date_dir, "image_001.png")
+            }
+        ],
+        "output_directory": mock_date_dir
+    }
     
     # Test data
     test_data = {
@@ -41,32 +44,38 @@ def test_generate_images_endpoint(mock_get_dir, mock_generate, mock_env_api_key,
     
     # Assert response
     assert response.status_code == 200
-    assert len(response.json()) == 1
-    assert response.json()[0]["prompt"] == "A test prompt"
-    assert response.json()[0]["success"] is True
-    assert response.json()[0]["image_path"] == os.path.join(mock_date_dir, "image_001.png")
-    
-    # Verify service was called with correct arguments
+    body = response.json()
+    assert body["request_id"] == "test-request"
+    assert body["output_directory"] == mock_date_dir
+    assert len(body["results"]) == 1
+    assert body["results"][0]["prompt"] == "A test prompt"
+    assert body["results"][0]["success"] is True
+    assert body["results"][0]["image_path"] == os.path.join(mock_date_dir, "image_001.png")
+    
+    # Verify service was called with the key from the settings dependency
     mock_generate.assert_called_once_with(
         prompts=["A test prompt"],
-        output_dir=None
+        api_key="fake_api_key"
     )
 
-@patch("app.services.image_generator.generate_multiple_images")
-def test_generate_images_with_custom_dir(mock_generate, mock_env_api_key):
-    # Mock the service response
-    mock_generate.return_value = [
-        {
-            "prompt": "A test prompt",
-            "success": True,
-            "image_path": "custom_dir/image_001.png"
-        }
-    ]
-    
-    # Test data with custom directory
+@patch("app.routers.image_generation.generate_multiple_images")
+def test_generate_images_failed_prompt(mock_generate, mock_env_api_key):
+    # Mock the service response with a failed generation
+    mock_generate.return_value = {
+        "request_id": "test-request",
+        "results": [
+            {
+                "prompt": "A test prompt",
+                "success": False,
+                "error": "No image data found in response"
+            }
+        ],
+        "output_directory": "generated_images/test-request"
+    }
+    
+    # Test data
     test_data = {
-        "prompts": ["A test prompt"],
-        "output_dir": "custom_dir"
+        "prompts": ["A test prompt"]
     }
     
     # Make request to the endpoint
@@ -74,15 +83,18 @@ def test_generate_images_with_custom_dir(mock_generate, mock_env_api_key):
     
     # Assert response
     assert response.status_code == 200
-    assert response.json()[0]["image_path"] == "custom_dir/image_001.png"
+    result = response.json()["results"][0]
+    assert result["success"] is False
+    assert result["image_path"] is None
+    assert result["error"] == "No image data found in response"
     
     # Verify service was called with correct arguments
     mock_generate.assert_called_once_with(
         prompts=["A test prompt"],
-        output_dir="custom_dir"
+        api_key="fake_api_key"
     )
 
-@patch("app.services.image_generator.generate_multiple_images")
+@patch("app.routers.image_generation.generate_multiple_images")
 def test_generate_images_empty_prompts(mock_generate, mock_env_api_key):
     # Test data with empty prompts
     test_data = {
@@ -99,9 +111,9 @@ def test_generate_images_empty_prompts(mock_generate, mock_env_api_key):
     # Verify service was not called
     mock_generate.assert_not_called()
 
-def test_generate_images_missing_api_key(monkeypatch):
+def test_generate_images_missing_api_key():
     # Ensure API key is not set
-    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    app.dependency_overrides[get_settings] = lambda: Settings(gemini_api_key=None)
     
     # Test data
     test_data = {
@@ -111,6 +123,8 @@ def test_generate_images_missing_api_key(monkeypatch):
     # Make request to the endpoint
     response = client.post("/images/generate", json=test_data)
     
+    app.dependency_overrides.pop(get_settings, None)
+    
     # Assert response
     assert response.status_code == 500
     assert "GEMINI_API_KEY environment variable not set" in response.json()["detail"]
@@ -119,7 +133,7 @@ def test_generate_images_missing_api_key(monkeypatch):
     "API key invalid",
     "Service unavailable"
 ])
-@patch("app.services.image_generator.generate_multiple_images")
+@patch("app.routers.image_generation.generate_multiple_images")
 def test_generate_images_service_error(mock_generate, mock_env_api_key, error_message):
     # Mock the service to raise an exception
     mock_generate.side_effect = Exception(error_message)
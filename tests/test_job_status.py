@@ -0,0 +1,52 @@
+import os
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.routers import svg_generation
+from app.services import job_status
+from app.services.job_status import FrameResult, JobStatusEnum, JobStatusManager
+
+client = TestClient(app, headers={"x-api-key": os.environ["API_KEY"]})
+
+@pytest.fixture
+def job_db_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_status, "GENERATED_IMAGES_DIR", str(tmp_path))
+    return tmp_path
+
+def test_managers_sharing_a_db_keep_each_others_updates(job_db_dir):
+    first = JobStatusManager()
+    second = JobStatusManager()
+    first.create_job("job-1", "request-1", 2)
+    # Cache the job in the second manager before the first one updates it
+    assert second.get_job("job-1").completed_frames == 0
+
+    first.update_job("job-1", FrameResult(id="1", success=True))
+    job = second.update_job("job-1", FrameResult(id="2", success=True))
+
+    assert job.completed_frames == 2
+    assert [r.id for r in job.results] == ["1", "2"]
+    assert job.status == JobStatusEnum.COMPLETED
+    assert [r.id for r in JobStatusManager().get_job("job-1").results] == ["1", "2"]
+
+def test_job_status_endpoint_returns_updated_job(job_db_dir, monkeypatch):
+    manager = JobStatusManager()
+    monkeypatch.setattr(svg_generation, "job_status_manager", manager)
+    manager.create_job("job-2", "request-2", 2)
+
+    response = client.get("/svg/job-status/job-2")
+    assert response.status_code == 200
+    assert response.json()["status"] == "pending"
+    assert response.json()["completed_frames"] == 0
+
+    manager.update_job("job-2", FrameResult(id="1", success=True))
+
+    response = client.get("/svg/job-status/job-2")
+    assert response.status_code == 200
+    assert response.json()["status"] == "processing"
+    assert response.json()["completed_frames"] == 1
+    assert response.json()["results"][0]["id"] == "1"
+
+def test_job_status_endpoint_unknown_job(job_db_dir, monkeypatch):
+    monkeypatch.setattr(svg_generation, "job_status_manager", JobStatusManager())
+    response = client.get("/svg/job-status/missing")
+    assert response.status_code == 404
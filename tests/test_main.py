@@ -0,0 +1,65 @@
+import os
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response
+from fastapi.testclient import TestClient
+from app.main import app
+from app.middleware import MediaAwareGZipMiddleware
+
+client = TestClient(app)
+
+def test_root_is_public():
+    response = client.get("/")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+
+def test_root_head_has_no_body():
+    response = client.head("/")
+    assert response.status_code == 200
+    assert response.content == b""
+
+def test_missing_api_key_is_rejected():
+    response = client.get("/example/")
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid or missing API key"
+
+def test_wrong_api_key_is_rejected():
+    response = client.get("/example/", headers={"x-api-key": "not-the-key"})
+    assert response.status_code == 401
+
+def test_non_ascii_api_key_is_rejected():
+    response = client.get("/example/", headers={"x-api-key": "clé".encode("utf-8")})
+    assert response.status_code == 401
+
+def test_valid_api_key_is_accepted():
+    response = client.get("/example/", headers={"x-api-key": os.environ["API_KEY"]})
+    assert response.status_code == 200
+
+def test_large_json_responses_are_gzipped():
+    headers = {"x-api-key": os.environ["API_KEY"], "Accept-Encoding": "gzip"}
+    response = client.get("/openapi.json", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+
+media_app = FastAPI()
+media_app.add_middleware(MediaAwareGZipMiddleware, minimum_size=500)
+
+@media_app.get("/media/{media_type:path}")
+def media(media_type: str):
+    return Response(b"x" * 4096, media_type=media_type)
+
+media_client = TestClient(media_app)
+
+@pytest.mark.parametrize("media_type", ["video/mp4", "image/png", "audio/mpeg"])
+def test_media_responses_are_not_gzipped(media_type):
+    response = media_client.get(f"/media/{media_type}", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-length"] == "4096"
+    assert response.content == b"x" * 4096
+
+def test_json_responses_are_gzipped():
+    response = media_client.get("/media/application/json", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == b"x" * 4096
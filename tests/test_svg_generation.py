@@ -0,0 +1,94 @@
+import os
+import shutil
+import subprocess
+from lxml import etree
+from PIL import Image
+from app.routers import svg_generation
+from app.routers.svg_generation import interpolate_color, interpolate_colors, parse_color
+
+def test_interpolate_colors_matches_interpolate_color():
+    steps = 7
+    expected = [interpolate_color("#10ff80", "#e00305", i / steps) for i in range(steps)]
+    assert interpolate_colors("#10ff80", "#e00305", steps) == expected
+
+def test_interpolate_colors_starts_at_from_color():
+    assert interpolate_colors("#000000", "#ff0000", 2) == ["#000000", "#bc0000"]
+
+def test_interpolate_color_mixes_in_linear_light():
+    # Half way between black and white is 50% linear light, not sRGB 127
+    assert interpolate_color("#000000", "#ffffff", 0.5) == "#bcbcbc"
+    assert interpolate_color("#336699", "#336699", 0.5) == "#336699"
+
+def test_parse_color_converts_rgb_to_hex():
+    assert parse_color("rgb(254, 254, 254)") == "#fefefe"
+    assert parse_color("#12ab34") == "#12ab34"
+
+def write_frames(frames_dir, size, count):
+    frames_dir.mkdir()
+    for i in range(count):
+        Image.new("RGB", size, "white").save(frames_dir / f"frame_{i:04d}.png")
+    return str(frames_dir)
+
+def test_concat_command_fits_sequences_of_different_sizes(tmp_path, monkeypatch):
+    monkeypatch.setattr(svg_generation, "get_encode_args", lambda: svg_generation.X264_ENCODE_ARGS)
+    first = write_frames(tmp_path / "frames_1", (64, 48), 2)
+    second = write_frames(tmp_path / "frames_2", (32, 80), 3)
+
+    cmd = svg_generation.build_concat_encode_command([first, second], 10, str(tmp_path / "out.mp4"))
+
+    filter_graph = cmd[cmd.index("-filter_complex") + 1]
+    for i in range(2):
+        assert (
+            f"[{i}:v]scale=64:48:force_original_aspect_ratio=decrease,"
+            f"pad=64:48:(ow-iw)/2:(oh-ih)/2,setsar=1[v{i}]"
+        ) in filter_graph
+    assert filter_graph.endswith("[v0][v1]concat=n=2:v=1:a=0[v]")
+
+    if shutil.which("ffmpeg"):
+        assert subprocess.run(cmd, capture_output=True).returncode == 0
+
+SVG_WITH_FIVE_PATHS = (
+    '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 10 10">'
+    '<path d="M0 0h10v10H0z" fill="rgb(254,254,254)"/>'
+    + "".join(f'<path d="M{i} 0h1v1H{i}z" fill="#000000"/>' for i in range(5))
+    + "</svg>"
+)
+
+def test_generate_frames_renders_distinct_frames_once_in_order(tmp_path, monkeypatch):
+    svg_path = tmp_path / "output_1.svg"
+    svg_path.write_text(SVG_WITH_FIVE_PATHS)
+    frames_dir = tmp_path / "frames_1"
+    frames_dir.mkdir()
+
+    rendered = []
+    def fake_svg_to_png(svg_data, output_path, width, height):
+        rendered.append(output_path)
+        with open(output_path, "wb") as f:
+            f.write(svg_data)
+
+    monkeypatch.setattr(svg_generation, "svg_to_png", fake_svg_to_png)
+    # More than one run, so runs are rendered on separate copies of the tree
+    monkeypatch.setattr(svg_generation, "MAX_RENDER_WORKERS", 2)
+
+    config = {"fps": 10, "hold_duration": 0.5, "animation": "both", "from": "#000000", "to": "#ff0000"}
+    assert svg_generation.generate_frames_for_svg(str(svg_path), str(frames_dir), 2.0, config)
+
+    frame_names = sorted(os.listdir(frames_dir))
+    assert frame_names == [f"frame_{i:04d}.png" for i in range(20)]
+
+    # 15 reveal frames show int(frame * 5 / 15) paths, the 5 hold frames show all of them
+    expected_visible = [i // 3 for i in range(15)] + [5] * 5
+    for name, visible in zip(frame_names, expected_visible):
+        tree = etree.fromstring((frames_dir / name).read_bytes())
+        paths = svg_generation.ANIMATED_PATHS(tree)
+        assert [p.get("opacity") for p in paths] == ["1"] * visible + ["0"] * (5 - visible)
+    hold_tree = etree.fromstring((frames_dir / "frame_0019.png").read_bytes())
+    assert {p.get("fill") for p in svg_generation.ANIMATED_PATHS(hold_tree)} == {"#ff0000"}
+
+    # One render per distinct frame; every other frame is a link to the first identical one
+    assert sorted(rendered) == [str(frames_dir / f"frame_{i:04d}.png") for i in (0, 3, 6, 9, 12, 15)]
+    first_inode = {}
+    for name, visible in zip(frame_names, expected_visible):
+        key = (visible, name >= "frame_0015.png")
+        inode = (frames_dir / name).stat().st_ino
+        assert first_inode.setdefault(key, inode) == inode